@@ -3,6 +3,6 @@ from .flightline import Box
 from .environment import Environment, WindModelBuilder, WindModel, Air
 from .model import Flow, Coefficients
 from .controls import Controls, Channels
-from .state import State
+from .state import State, StateStream
 from .schedule import *
 from .analysis import *
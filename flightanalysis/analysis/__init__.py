@@ -1,2 +1,3 @@
 from .manoeuvre_analysis import ManoeuvreAnalysis, ScheduleAnalysis
 from .aircraft_analysis import WindModel, WindModelBuilder, fit_wind
+from .batch import score_fcj, score_fcjs
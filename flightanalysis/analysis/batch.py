@@ -0,0 +1,57 @@
+"""Score many FlightCoach json files at once, for example all the flights from a competition."""
+from __future__ import annotations
+import warnings
+from pathlib import Path
+from json import load
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, Tuple, Union
+from .manoeuvre_analysis import ScheduleAnalysis, ManoeuvreResults
+
+
+def score_fcj(file: str) -> Tuple[str, Dict[str, ManoeuvreResults]]:
+    """Score every manoeuvre in a FlightCoach json.
+
+    Returns:
+        Tuple[str, Dict[str, ManoeuvreResults]]: the file and the results for each manoeuvre
+    """
+    with open(file, 'r') as f:
+        data = load(f)
+    sdef, state = ScheduleAnalysis.parse_fcj(data)
+    return file, {ma.uid: ma.scores() for ma in ScheduleAnalysis.build(sdef, state)}
+
+
+def score_fcjs(files: Union[str, Path, Iterable[str]], workers: int=None) -> Iterator[Tuple[str, Union[Dict[str, ManoeuvreResults], Exception]]]:
+    """Score many FlightCoach jsons, yielding the results for each flight as soon as it has been scored.
+    Each worker process keeps the schedule definitions it has loaded (see SchedDef.load) for the following flights.
+    A flight that cannot be scored does not stop the others, a warning is raised and the exception is yielded in place of its results.
+
+    Args:
+        files (Union[str, Path, Iterable[str]]): a folder containing the json files, a single json file 
+            or an iterable of the files.
+        workers (int, optional): the number of processes to score with. 1 scores them in this process, 
+            None uses one process per cpu. Defaults to None.
+
+    Yields:
+        Iterator[Tuple[str, Union[Dict[str, ManoeuvreResults], Exception]]]: the file and the results for 
+            each manoeuvre or the exception raised when scoring it, in the order the flights finish.
+    """
+    if isinstance(files, (str, Path)):
+        files = sorted(Path(files).glob("*.json")) if Path(files).is_dir() else [files]
+    files = [str(f) for f in files]
+
+    if workers == 1:
+        for file in files:
+            try:
+                yield score_fcj(file)
+            except Exception as ex:
+                warnings.warn(f"failed to score {file}: {ex!r}")
+                yield file, ex
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {pool.submit(score_fcj, file): file for file in files}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as ex:
+                    warnings.warn(f"failed to score {futures[future]}: {ex!r}")
+                    yield futures[future], ex
@@ -12,6 +12,8 @@ from flightanalysis.schedule.definition.manoeuvre_info import Position
 from geometry import Transformation, Quaternion, Q0, Coord
 from typing import Any, List, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 
 @dataclass
@@ -53,10 +55,10 @@ class ManoeuvreResults:
 
     @staticmethod
     def from_dict(data):
-        return Manoeuvre(
+        return ManoeuvreResults(
             Results.from_dict(data['inter']),
             ElementsResults.from_dict(data['intra']),
-            Result.from_dict(data['positioning']),
+            Results.from_dict(data['positioning']),
         )
 
 
@@ -68,12 +70,13 @@ class ManoeuvreAnalysis:
     intended_template: State
     corrected: Manoeuvre
     corrected_template: State
+    intra_results: ElementsResults = None # the measurements are kept here, see intra
     
     def __getitem__(self, i):
         return self.get_ea(self.mdef.eds[i])
 
     def __getattr__(self, name):
-        if name in self.mdef.eds.data.keys():
+        if "mdef" in self.__dict__ and name in self.mdef.eds.data.keys():
             return self.get_ea(self.mdef.eds[name])
         raise AttributeError()
 
@@ -83,14 +86,21 @@ class ManoeuvreAnalysis:
         tp = el.get_data(self.intended_template).relocate(st.pos[0])
         return ElementAnalysis(edef,el,st,tp, el.ref_frame(tp))
 
-    def to_dict(self):
+    def to_dict(self, include_measurements: bool=False, **kwargs):
+        """kwargs are passed to State.to_dict, compact=True gives a much smaller columnar encoding.
+
+        Args:
+            include_measurements (bool, optional): include the intra measurements taken by intra, so they do 
+                not need to be taken again after from_dict. They are large and not compacted. Defaults to False.
+        """
         return dict(
             mdef = self.mdef.to_dict(),
-            aligned = self.aligned.to_dict(),
+            aligned = self.aligned.to_dict(**kwargs),
             intended = self.intended.to_dict(),
-            intended_template = self.intended_template.to_dict(),
+            intended_template = self.intended_template.to_dict(**kwargs),
             corrected = self.corrected.to_dict(),
-            corrected_template = self.corrected_template.to_dict()
+            corrected_template = self.corrected_template.to_dict(**kwargs),
+            **(dict(intra_results=self.intra_results.to_dict()) if include_measurements and not self.intra_results is None else {})
         )
 
     @staticmethod
@@ -102,6 +112,7 @@ class ManoeuvreAnalysis:
             State.from_dict(data["intended_template"]),
             Manoeuvre.from_dict(data["corrected"]),
             State.from_dict(data["corrected_template"]),
+            ElementsResults.from_dict(data["intra_results"]) if "intra_results" in data else None
         )
 
     @property
@@ -119,14 +130,16 @@ class ManoeuvreAnalysis:
     
     @staticmethod
     def template(mdef: ManDef, itrans: Transformation) -> Tuple[Manoeuvre, State]:
-        man = mdef.create(itrans).add_lines()
-        return man, man.create_template(itrans)
+        return mdef.create_template(itrans)
 
     @staticmethod
-    def alignment(template: State, man: Manoeuvre, flown: State, radius=10) -> Tuple(float, State):
-        aligned = State.align(flown, template, radius=10)[1]
+    def alignment(template: State, man: Manoeuvre, flown: State, radius=10, engine: str="dtw") -> Tuple(float, State):
+        """Align the flown data to the template, then again to the template of the intended manoeuvre.
+        engine and radius are passed to State.align, engine="multiscale" makes long manoeuvres much 
+        cheaper to align, a larger radius makes it more likely to find the optimal alignment."""
+        aligned = State.align(flown, template, radius=radius, engine=engine)[1]
         int_tp = man.match_intention(template[0], aligned)[1]
-        return State.align(aligned, int_tp, radius=radius, mirror=False)
+        return State.align(aligned, int_tp, radius=radius, mirror=False, engine=engine)
 
     @staticmethod
     def intention(man: Manoeuvre, aligned: State, template: State) -> Tuple[Manoeuvre, State]:
@@ -138,10 +151,22 @@ class ManoeuvreAnalysis:
         return mdef.create(int_tp[0].transform).add_lines()
 
     @staticmethod
-    def build(mdef: ManDef, flown: State):
+    def build(mdef: ManDef, flown: State, rate: float=None, engine: str="dtw"):
+        """Analyse a flown manoeuvre.
+
+        Args:
+            mdef (ManDef): the manoeuvre definition
+            flown (State): the flown manoeuvre
+            rate (float, optional): resample the flown data to this many samples per second first, 
+                see State.resample. The cost of alignment and scoring scales with the number of samples. 
+                Defaults to None, which uses the data as it is.
+            engine (str, optional): the alignment engine, see ManoeuvreAnalysis.alignment. Defaults to "dtw".
+        """
+        if rate is not None:
+            flown = flown.resample(rate)
         itrans = ManoeuvreAnalysis.initial_transform(mdef, flown)
         man, tp = ManoeuvreAnalysis.template(mdef, itrans)
-        aligned = ManoeuvreAnalysis.alignment(tp, man, flown)[1]
+        aligned = ManoeuvreAnalysis.alignment(tp, man, flown, engine=engine)[1]
         intended, int_tp = ManoeuvreAnalysis.intention(man, aligned, tp)
         corr = ManoeuvreAnalysis.correction(mdef, intended, int_tp, aligned)
         return ManoeuvreAnalysis(mdef, aligned, intended, int_tp, corr, corr.create_template(int_tp[0], aligned))
@@ -219,7 +244,12 @@ class ManoeuvreAnalysis:
         return Result("distance", [], [],[dist],[dist_dg],dist_key)
 
     def intra(self):
-        return self.intended.analyse(self.aligned, self.intended_template)
+        """The intra downgrades. The measurements are taken on the first call and kept, after that
+        only the current criteria are applied to them, so changes to the criteria are cheap to score."""
+        if self.intra_results is None:
+            self.intra_results = self.intended.analyse(self.aligned, self.intended_template)
+            return self.intra_results
+        return self.intended.rescore(self.intra_results)
 
     def inter(self):
         return self.mdef.mps.collect(self.intended, self.intended_template)
@@ -266,27 +296,59 @@ class ScheduleAnalysis(Collection):
     VType=ManoeuvreAnalysis
 
     @staticmethod
-    def from_fcj(file: str):
-        with open(file, 'r') as f:
-            data = load(f)
+    def build(sdef: SchedDef, state: State, workers: int=1, rate: float=None, engine: str="dtw") -> ScheduleAnalysis:
+        """Analyse every manoeuvre in a labelled State.
+
+        Args:
+            sdef (SchedDef): the schedule definition
+            state (State): the flight, labelled with the manoeuvre short names
+            workers (int, optional): the number of processes to analyse the manoeuvres with. 1 analyses 
+                them in this process, None uses one process per cpu. Defaults to 1.
+            rate (float, optional): resample each manoeuvre to this rate, see ManoeuvreAnalysis.build. 
+                Defaults to None.
+            engine (str, optional): the alignment engine, see ManoeuvreAnalysis.alignment. Defaults to "dtw".
+
+        Returns:
+            ScheduleAnalysis: the analyses, in the same order as the schedule definition
+        """
+        mdefs = list(sdef)
+        flowns = [state.get_manoeuvre(mdef.info.short_name) for mdef in mdefs]
+        build = partial(ManoeuvreAnalysis.build, rate=rate, engine=engine)
+        if workers == 1:
+            return ScheduleAnalysis(list(map(build, mdefs, flowns)))
+        
+        with ProcessPoolExecutor(workers) as pool:
+            return ScheduleAnalysis(list(pool.map(build, mdefs, flowns)))
 
+    @staticmethod
+    def parse_fcj(data: dict, sdef: SchedDef=None) -> Tuple[SchedDef, State]:
+        """Read the schedule definition and the State labelled by manoeuvre from a FlightCoach json.
+        If the json has not been split into manoeuvres they are found with SchedDef.segment.
+
+        Args:
+            data (dict): the FlightCoach json
+            sdef (SchedDef, optional): the schedule definition to use, loaded from the package
+                resources if not provided.
+        """
         flight = Flight.from_fc_json(data)
         box = Box.from_fcjson_parmameters(data["parameters"])
 
-        sdef = SchedDef.load(data["parameters"]["schedule"][1])
+        if sdef is None:
+            sdef = SchedDef.load(data["parameters"]["schedule"][1])
 
-        state = State.from_flight(flight, box).splitter_labels(
-            data["mans"],
-            [m.info.short_name for m in sdef]
-        )
-        mas=[]
-        for mdef in sdef:
-            mas.append(ManoeuvreAnalysis.build(
-                mdef, 
-                state.get_manoeuvre(mdef.info.short_name)
-            ))
+        state = State.from_flight(flight, box)
+        if "mans" in data:
+            state = state.splitter_labels(data["mans"], [m.info.short_name for m in sdef])
+        else:
+            state = sdef.segment(state)
+        return sdef, state
+
+    @staticmethod
+    def from_fcj(file: str, workers: int=1):
+        with open(file, 'r') as f:
+            data = load(f)
         
-        return ScheduleAnalysis(mas)
+        return ScheduleAnalysis.build(*ScheduleAnalysis.parse_fcj(data), workers)
 
 
 
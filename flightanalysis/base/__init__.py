@@ -1,4 +1,5 @@
 from .table import Time, Table, Constructs, SVar
+from .table_file import TableFile
 from .collection import Collection
 
 
@@ -0,0 +1,80 @@
+"""A single file container for named numpy arrays that can be memory mapped.
+
+The file holds a magic string, the length of a json header, the header and then the raw
+array data, each array aligned to 64 bytes. The header describes the arrays (offset, dtype,
+shape) and can carry any other json serialisable metadata.
+"""
+from __future__ import annotations
+import json
+import numpy as np
+import numpy.typing as npt
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+
+MAGIC = b"FATABLE1"
+ALIGN = 64
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+
+def write_arrays(file: Union[str, Path], arrays: Dict[str, npt.NDArray], meta: dict=None) -> Union[str, Path]:
+    """Write the arrays and metadata to file"""
+    arrays = {k: np.ascontiguousarray(v) for k, v in arrays.items()}
+    for k, v in arrays.items():
+        if v.dtype.hasobject:
+            raise TypeError(f"Cannot write array {k} of dtype object")
+
+    layout, offset = {}, 0
+    for k, v in arrays.items():
+        layout[k] = dict(offset=offset, dtype=v.dtype.str, shape=list(v.shape))
+        offset += v.nbytes + _pad(v.nbytes)
+
+    header = json.dumps(dict(meta=meta or {}, arrays=layout)).encode()
+    header += b" " * _pad(len(MAGIC) + 8 + len(header))
+
+    with open(file, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for v in arrays.values():
+            f.write(v.tobytes())
+            f.write(b"\0" * _pad(v.nbytes))
+    return file
+
+
+def read_header(file: Union[str, Path]) -> Tuple[dict, int]:
+    """Read the header and the offset the array data starts at"""
+    with open(file, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file} is not a flightanalysis table file")
+        n = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        return json.loads(f.read(n)), len(MAGIC) + 8 + n
+
+
+def read_arrays(file: Union[str, Path], mmap: bool=True) -> Tuple[Dict[str, npt.NDArray], dict]:
+    """Read the arrays and metadata from file.
+
+    Args:
+        mmap (bool): memory map the arrays read only rather than reading them into memory.
+    """
+    header, start = read_header(file)
+    arrays = {}
+    if mmap:
+        for k, v in header["arrays"].items():
+            arrays[k] = np.memmap(
+                file, dtype=v["dtype"], mode="r", shape=tuple(v["shape"]), offset=start + v["offset"]
+            ) if np.prod(v["shape"]) > 0 else np.empty(v["shape"], dtype=v["dtype"])
+    else:
+        with open(file, "rb") as f:
+            f.seek(start)
+            buffer = f.read()
+        for k, v in header["arrays"].items():
+            dtype = np.dtype(v["dtype"])
+            count = int(np.prod(v["shape"]))
+            arrays[k] = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=v["offset"]
+            ).reshape(v["shape"])
+    return arrays, header["meta"]
@@ -26,8 +26,9 @@ class Collection:
             assert all(isinstance(v, self.__class__.VType) for v in self.data.values())
 
     def __getattr__(self, name) -> T:
-        if name in self.data:
-            return self.data[name]
+        data = self.__dict__.get("data", {}) # data is not set yet when unpickling
+        if name in data:
+            return data[name]
         raise AttributeError(f"{name} not found in {self.__class__}")
 
     def __getitem__(self, key: Union[int, str, slice]) -> Union[Self, T]:
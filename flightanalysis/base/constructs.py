@@ -28,6 +28,7 @@ class Constructs(Collection):
     def __init__(self, data):
         super().__init__(data)
         self._cols = list(chain(*[c.keys for c in self.data.values()]))
+        self._lookup = {k: (c.name, i) for c in self.data.values() for i, k in enumerate(c.keys)}
 
     def subset(self, names: List[str]):
         """get a subset of the constructs"""
@@ -65,4 +66,8 @@ class Constructs(Collection):
             yield val
 
     def cols(self):
-        return self._cols
\ No newline at end of file
+        return self._cols
+
+    def lookup(self, col: str):
+        """return the name of the construct containing col and its position in the keys"""
+        return self._lookup[col]
\ No newline at end of file
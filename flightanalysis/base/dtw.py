@@ -0,0 +1,196 @@
+"""Dynamic time warping on whole numpy arrays.
+
+The accumulated cost matrix is swept one anti-diagonal at a time, all the cells on an
+anti-diagonal only depend on the previous two so each sweep is a handful of vectorised
+operations rather than a python call per cell. The search can be restricted to a window,
+given as the first and last+1 column allowed in each row.
+"""
+from __future__ import annotations
+import numpy as np
+import numpy.typing as npt
+from typing import Tuple, List
+
+
+Window = Tuple[npt.NDArray, npt.NDArray]
+
+
+def full_window(n: int, m: int) -> Window:
+    """A window covering the whole n x m cost matrix"""
+    return np.zeros(n, dtype=int), np.full(n, m, dtype=int)
+
+
+def sakoe_chiba_window(n: int, m: int, radius: int) -> Window:
+    """A band of width 2 * radius + 1 columns about the diagonal of the n x m cost matrix"""
+    centre = np.arange(n) * (m - 1) / max(n - 1, 1)
+    radius = max(radius, 1 + (m - 1) / max(n - 1, 1))  # the band must stay connected
+    lo = np.clip(np.ceil(centre - radius), 0, m - 1).astype(int)
+    hi = np.clip(np.floor(centre + radius) + 1, 1, m).astype(int)
+    lo[0], hi[-1] = 0, m
+    return lo, hi
+
+
+def dtw(x: npt.NDArray, y: npt.NDArray, window: Window=None) -> Tuple[float, List[Tuple[int, int]]]:
+    """Align two multivariate series using the euclidean distance between samples.
+
+    Args:
+        x (npt.NDArray): first series, shape (n, k) or (n,)
+        y (npt.NDArray): second series, shape (m, k) or (m,)
+        window (Window, optional): (lo, hi) arrays of length n. Row i of the cost matrix is only
+            searched between columns lo[i] and hi[i] - 1. lo and hi must not decrease. Defaults
+            to the full matrix.
+
+    Returns:
+        Tuple[float, List[Tuple[int, int]]]: the accumulated distance and the warping path
+            as a list of (x index, y index), the same contract as fastdtw.
+    """
+    x = np.asarray(x, dtype=float).reshape(len(x), -1)
+    y = np.asarray(y, dtype=float).reshape(len(y), -1)
+    n, m = len(x), len(y)
+    lo, hi = full_window(n, m) if window is None else window
+
+    rows = np.arange(n)
+    first_row = np.searchsorted(hi + rows, np.arange(n + m - 1), side="right")
+    last_row = np.searchsorted(lo + rows, np.arange(n + m - 1), side="right")
+
+    # cost along an anti-diagonal, indexed by row + 1 so that index 0 is row -1. The three 
+    # buffers are reused, only resetting the cells that were set, so each sweep only touches the window.
+    prev2, prev, cost = (np.full(n + 1, np.inf) for _ in range(3))
+    prev2[0] = 0
+    set2, set1, set0 = slice(0, 1), slice(0, 0), slice(0, 0)
+    steps = []
+    for k in range(n + m - 1):
+        a, b = first_row[k], last_row[k]
+        i = rows[a:b]
+        options = np.stack([
+            prev2[i],      # (i-1, j-1)
+            prev[i],       # (i-1, j)
+            prev[i + 1],   # (i, j-1)
+        ])
+        step = np.argmin(options, axis=0)
+        cost[set0] = np.inf
+        cost[a + 1:b + 1] = options[step, np.arange(len(i))] + np.linalg.norm(x[i] - y[k - i], axis=1)
+        steps.append(step.astype(np.int8))
+        prev2, prev, cost = prev, cost, prev2
+        set2, set1, set0 = set1, slice(a + 1, b + 1), set2
+
+    distance = prev[n]
+    if not np.isfinite(distance):
+        raise ValueError("no warping path exists within the window")
+
+    i, j = n - 1, m - 1
+    path = [(i, j)]
+    while i > 0 or j > 0:
+        step = steps[i + j][i - first_row[i + j]]
+        if step == 0:
+            i, j = i - 1, j - 1
+        elif step == 1:
+            i = i - 1
+        else:
+            j = j - 1
+        path.append((i, j))
+    return distance, path[::-1]
+
+
+def path_window(path: List[Tuple[int, int]], n: int, m: int, radius: int=1, scale: int=1) -> Window:
+    """A window around a warping path, for instance from a coarser alignment.
+
+    Args:
+        path (List[Tuple[int, int]]): the warping path
+        n (int): rows of the cost matrix to build the window for
+        m (int): columns of the cost matrix to build the window for
+        radius (int, optional): cells to widen the window by on each side. Defaults to 1.
+        scale (int, optional): each cell of the path covers scale x scale cells of the n x m 
+            matrix. Defaults to 1.
+    """
+    p = np.asarray(path)
+    lo, hi = np.full(n, m), np.zeros(n, dtype=int)
+    for di in range(scale):
+        rows = np.minimum(p[:, 0] * scale + di, n - 1)
+        np.minimum.at(lo, rows, np.minimum(p[:, 1] * scale, m - 1))
+        np.maximum.at(hi, rows, np.minimum(p[:, 1] * scale + scale, m))
+    lo = np.minimum.accumulate(lo[::-1])[::-1]
+    hi = np.maximum.accumulate(hi)
+
+    lo = np.clip(lo[np.maximum(np.arange(n) - radius, 0)] - radius, 0, m - 1)
+    hi = np.clip(hi[np.minimum(np.arange(n) + radius, n - 1)] + radius, 1, m)
+    lo[0], hi[-1] = 0, m
+    return lo, hi
+
+
+def _coarsen(a: npt.NDArray) -> npt.NDArray:
+    """halve the length of a series by averaging pairs of samples"""
+    if len(a) % 2 == 1:
+        a = np.vstack([a, a[-1:]])
+    return (a[0::2] + a[1::2]) / 2
+
+
+def multiscale_dtw(x: npt.NDArray, y: npt.NDArray, radius: int=1, min_size: int=None) -> Tuple[float, List[Tuple[int, int]]]:
+    """Coarse to fine dtw, as in fastdtw. Both series are halved in length until the shorter one has at 
+    most min_size samples, that is aligned in full, and each path is then projected onto the next finer 
+    level to give the window searched there. The cost is roughly linear in the length of the series 
+    rather than quadratic, but the path can miss the optimum if it falls outside the window.
+
+    Args:
+        x (npt.NDArray): first series, shape (n, k) or (n,)
+        y (npt.NDArray): second series, shape (m, k) or (m,)
+        radius (int, optional): cells to widen each projected path by, larger is slower but more 
+            likely to find the optimal path. Defaults to 1.
+        min_size (int, optional): length of the shorter series at the coarsest level. Defaults to radius + 2.
+
+    Returns:
+        Tuple[float, List[Tuple[int, int]]]: as dtw
+    """
+    x = np.asarray(x, dtype=float).reshape(len(x), -1)
+    y = np.asarray(y, dtype=float).reshape(len(y), -1)
+    min_size = radius + 2 if min_size is None else min_size
+    if min(len(x), len(y)) <= min_size:
+        return dtw(x, y)
+    path = multiscale_dtw(_coarsen(x), _coarsen(y), radius, min_size)[1]
+    return dtw(x, y, path_window(path, len(x), len(y), radius, 2))
+
+
+def subsequence_dtw(x: npt.NDArray, y: npt.NDArray) -> Tuple[float, List[Tuple[int, int]]]:
+    """Find the section of a long series x that best matches all of y.
+
+    The rows of x are visited once, in order, each updating the accumulated cost of every row of y.
+    Each row of x advances y by 0, 1 or 2 rows, so x can run anywhere from twice as fast as y to
+    arbitrarily slower. Skipped rows of y are still charged so faster sections are not favoured. Only the step
+    taken into each cell is stored, so memory is linear in len(x) for a given y.
+
+    Args:
+        x (npt.NDArray): long series, shape (n, k) or (n,)
+        y (npt.NDArray): series to find in x, shape (m, k) or (m,)
+
+    Returns:
+        Tuple[float, List[Tuple[int, int]]]: the accumulated distance and the warping path
+            as a list of (x index, y index), from the first to the last row of y.
+    """
+    x = np.asarray(x, dtype=float).reshape(len(x), -1)
+    y = np.asarray(y, dtype=float).reshape(len(y), -1)
+    n, m = len(x), len(y)
+
+    steps = np.empty((n, m), dtype=np.int8)
+    prev = np.full(m, np.inf)
+    distance, end = np.inf, None
+    options = np.full((3, m), np.inf)
+    for i in range(n):
+        d = np.linalg.norm(y - x[i], axis=1)
+        options[0, 0] = d[0]                        # the match can start on any row of x
+        options[0, 1:] = prev[:-1] + d[1:]          # (i-1, j-1)
+        options[1, 1:] = prev[1:] + d[1:]           # (i-1, j), y waits
+        options[2, 2:] = prev[:-2] + d[1:-1] + d[2:]  # (i-1, j-2)
+        steps[i] = np.argmin(options, axis=0)       # ties go to the diagonal
+        prev = options[steps[i], np.arange(m)]
+        if prev[-1] < distance:
+            distance, end = prev[-1], i
+
+    if end is None:
+        raise ValueError("x is too short to contain y")
+
+    i, j = end, m - 1
+    path = [(i, j)]
+    while j > 0:
+        j = j - (1, 0, 2)[steps[i, j]]
+        i = i - 1
+        path.append((i, j))
+    return distance, path[::-1]
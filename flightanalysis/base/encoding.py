@@ -0,0 +1,63 @@
+"""Compact json friendly encodings of numpy arrays and label columns."""
+from __future__ import annotations
+import zlib
+from base64 import b64encode, b64decode
+import numpy as np
+import numpy.typing as npt
+from typing import Union
+
+
+def encode_array(arr: npt.NDArray, dtype: str="float64", delta: bool=False, compress: bool=False) -> Union[list, dict]:
+    """Encode a 1D array.
+
+    Args:
+        arr (npt.NDArray): the array
+        dtype (str): the dtype to store, "float32" halves the size at the cost of precision.
+        delta (bool): store the differences between the bit patterns of consecutive values,
+            which is lossless and makes slowly changing data compress much better.
+        compress (bool): zlib compress the data.
+
+    Returns:
+        Union[list, dict]: a list of values if neither delta or compress is used, otherwise a dict
+            holding the base64 encoded bytes.
+    """
+    arr = np.ascontiguousarray(arr, dtype=dtype)
+    if not delta and not compress:
+        return arr.tolist()
+    if delta:
+        bits = arr.view(f"u{arr.dtype.itemsize}")
+        arr = np.diff(bits, prepend=bits.dtype.type(0))
+    data = arr.tobytes()
+    if compress:
+        data = zlib.compress(data)
+    return dict(dtype=np.dtype(dtype).str, delta=delta, compress=compress, data=b64encode(data).decode())
+
+
+def decode_array(data: Union[list, dict]) -> npt.NDArray:
+    """Decode an array created by encode_array"""
+    if isinstance(data, list):
+        return np.array(data, dtype=float)
+    raw = b64decode(data["data"])
+    if data["compress"]:
+        raw = zlib.decompress(raw)
+    dtype = np.dtype(data["dtype"])
+    if data["delta"]:
+        arr = np.cumsum(np.frombuffer(raw, dtype=f"u{dtype.itemsize}"), dtype=f"u{dtype.itemsize}").view(dtype)
+    else:
+        arr = np.frombuffer(raw, dtype=dtype)
+    return arr.astype(float)
+
+
+def encode_runs(values: npt.NDArray) -> dict:
+    """Run length encode a label column"""
+    values = np.asarray(values)
+    starts = np.flatnonzero(np.append(True, values[1:] != values[:-1]))
+    return dict(
+        values=[v.item() if isinstance(v, np.generic) else v for v in values[starts]],
+        lengths=np.diff(np.append(starts, len(values))).tolist()
+    )
+
+
+def decode_runs(data: dict) -> npt.NDArray:
+    """Decode a label column created by encode_runs"""
+    return np.repeat(np.array(data["values"], dtype=object), data["lengths"])
@@ -4,7 +4,10 @@ import pandas as pd
 import numpy.typing as npt
 from geometry import Base,  Point, Quaternion, Transformation
 from typing import Union, Dict, Self
+from itertools import chain
 from .constructs import SVar, Constructs
+from .archive import write_arrays, read_arrays
+from .encoding import encode_array, decode_array, encode_runs, decode_runs
 from numbers import Number
 
 from time import time
@@ -41,85 +44,319 @@ class Time(Base):
 
 def make_time(tab):
     return Time.from_t(tab.t)
+
+
+def wrap(obj, arr: np.ndarray) -> Base:
+    """create a geometry object around an existing 2D array without copying it."""
+    if obj.__init__ is Base.__init__:
+        res = obj.__new__(obj)
+        res.data = arr
+        return res
+    return obj(arr)
+
+
+def freeze(arr: np.ndarray) -> np.ndarray:
+    """Mark an array as read only. Table data is shared between instances so it must
+    never be modified in place."""
+    arr.flags.writeable = False
+    return arr
+
     
 class Table:
     constructs = Constructs([
          SVar("time", Time,        ["t", "dt"]               , make_time )
     ])
 
-    def __init__(self, data: pd.DataFrame, fill=True, min_len=1):
+    def __init__(self, data: pd.DataFrame, fill=True, min_len=1, lazy=False):
         if len(data) < min_len:
             raise Exception(f"State constructor length check failed, data length = {len(data)}, min_len = {min_len}")
-        self.base_cols = [c for c in data.columns if c in self.constructs.cols()]
-        self.label_cols = [c for c in data.columns if not c in self.constructs.cols()]
-    
-        self.data = data
+        cols = self.constructs.cols()
+        existing = self.constructs.existing(data.columns)
+
+        self._setup(
+            {svar.name: data.loc[:, svar.keys].to_numpy(dtype=float) for svar in existing},
+            {c: data[c].to_numpy(dtype=float) for c in data.columns if c in cols and not c in existing.cols()},
+            {c: data[c].to_numpy() for c in data.columns if not c in cols},
+            np.asarray(data.index) - data.index[0],
+            fill,
+            lazy
+        )
 
-        self.data.index = self.data.index - self.data.index[0]
+    def _setup(self, cdata: Dict[str, np.ndarray], partial: Dict[str, np.ndarray], ldata: Dict[str, np.ndarray], index: np.ndarray, fill: bool, lazy: bool=False, check: bool=True):
+        """Populate the columnar storage. 
         
-        if fill:
-            missing = self.constructs.missing(self.data.columns)
-            for svar in missing:
-                
-                newdata = svar.builder(self).to_pandas(
-                    columns=svar.keys, 
-                    index=self.data.index
-                ).loc[:, [key for key in svar.keys if key not in self.data.columns]]
-                
-                self.data = pd.concat([self.data, newdata], axis=1)
-            bcs = self.constructs.cols()
-        else:
-            bcs = self.base_cols
-        if np.any(np.isnan(self.data.loc[:,bcs])):
+        Args:
+            cdata: 2D arrays, one per fully populated construct.
+            partial: 1D arrays for the columns of constructs that are only partly populated.
+            ldata: 1D arrays, one per label column.
+            index: the zeroed index.
+            fill: Build the missing constructs.
+            lazy: Defer building the missing constructs until they are first accessed.
+            check: Check the data for nans, skip if it is known to be valid.
+        """
+        self._cdata = {k: freeze(np.ascontiguousarray(v)) for k, v in cdata.items()}
+        self._partial = partial
+        self._ldata = ldata
+        self._index = freeze(index)
+        self._data = None
+        self._lindex = {}
+        self.label_cols = list(ldata.keys())
+        self._pending = [svar.name for svar in self.constructs if fill and not svar.name in self._cdata]
+
+        if check and any(np.any(np.isnan(arr)) for arr in chain(self._cdata.values(), self._partial.values())):
+            raise ValueError("nan values in data")
+
+        if not lazy:
+            self._derive_all()
+        return self
+
+    def _derive(self, name: str) -> np.ndarray:
+        """Build a missing construct from the rest of the table and cache it."""
+        svar = self.constructs.data[name]
+        self._pending.remove(name)
+        arr = np.array(svar.builder(self).data, dtype=float, order="C")
+        for i, key in enumerate(svar.keys):
+            if key in self._partial:
+                arr[:, i] = self._partial.pop(key)
+        if np.any(np.isnan(arr)):
             raise ValueError("nan values in data")
+        self._cdata[name] = freeze(arr)
+        return arr
+
+    def _derive_all(self):
+        while len(self._pending) > 0:
+            self._derive(self._pending[0])
+
+    @classmethod
+    def _from_arrays(Cls, cdata: Dict[str, np.ndarray], ldata: Dict[str, np.ndarray]=None, index: np.ndarray=None, fill=True, lazy=True) -> Self:
+        """Create a Table directly from the columnar storage, bypassing the DataFrame.
+        Missing constructs are derived lazily by default."""
+        if index is None:
+            index = cdata["time"][:,0] - cdata["time"][0,0]
+        return Cls.__new__(Cls)._setup(cdata, {}, {} if ldata is None else ldata, index, fill, lazy)
+
+    @classmethod
+    def stack(Cls, sections: list, **labels) -> Self:
+        """Stack a list of Tables on top of each other. last row of each is replaced with first row of the next, 
+            indexes are offset so they are sequential. Any labels passed as kwargs are given to every row.
+        """
+        if not all(
+            len(sec._partial) == 0 and
+            sec.label_cols == sections[0].label_cols and 
+            sec.base_cols == sections[0].base_cols for sec in sections
+        ):
+            return Cls._stack_frames(sections).label(**labels)
+        
+        # each section but the last loses its last row, as the first row of the next replaces it
+        lens = [len(sec) - 1 for sec in sections[:-1]] + [len(sections[-1])]
+        stops = np.cumsum(lens)
+        starts = stops - lens
+        offsets = np.cumsum([0] + [sec.duration for sec in sections[:-1]])
+
+        def fill(get, dtype=float):
+            first = get(sections[0])
+            buf = np.empty((stops[-1],) + first.shape[1:], dtype=dtype)
+            for sec, start, stop in zip(sections, starts, stops):
+                buf[start:stop] = get(sec)[:stop-start]
+            return buf
+
+        index = fill(lambda sec: sec._index)
+        for start, stop, offset in zip(starts, stops, offsets):
+            index[start:stop] += offset
         
+        for sec in sections:
+            sec._derive_all()
+        cdata = {k: fill(lambda sec: sec._cdata[k]) for k in sections[0]._cdata.keys()}
+        cdata["time"][:, 0] = index
+        def label_dtype(k):
+            dtypes = [sec._ldata[k].dtype for sec in sections]
+            return np.result_type(*dtypes) if len(set(dt.kind for dt in dtypes)) == 1 else object
+
+        ldata = {k: fill(lambda sec: sec._ldata[k], label_dtype(k)) for k in sections[0].label_cols}
+        for k, v in labels.items():
+            ldata[k] = np.full(stops[-1], v, dtype=object)
 
-    def __getattr__(self, name: str) -> Union[pd.DataFrame, Base]:
-        if name in self.data.columns:
-            return self.data[name].to_numpy()
-        elif name in self.constructs.data.keys():
-            con = self.constructs.data[name]
-            return con.obj(self.data.loc[:, con.keys])
+        # the sections are already valid so there is nothing to check or fill
+        return Cls.__new__(Cls)._setup(cdata, {}, ldata, index, False, check=False)
+
+    @classmethod
+    def _stack_frames(Cls, sections: list) -> Self:
+        """Stack via pandas, for sections that do not share the same columns"""
+        offsets = np.cumsum([0] + [sec.duration for sec in sections[:-1]])
+        dfs = [section.data.iloc[:-1] for section in sections[:-1]] + \
+            [sections[-1].data.copy()]
+        for df, offset in zip(dfs, offsets):
+            df.index = np.array(df.index) - df.index[0] + offset
+        combo = pd.concat(dfs)
+        combo.index.name = "t"
+        combo["t"] = combo.index
+        return Cls(combo)
+
+    @property
+    def base_cols(self) -> list[str]:
+        return [c for c in self.constructs.cols() if self._has_col(c)]
+
+    def _has_col(self, name: str) -> bool:
+        if name in self._partial:
+            return True
+        svar = self.constructs.lookup(name)[0]
+        return svar in self._cdata or svar in self._pending
+
+    def __getattr__(self, name: str) -> Union[npt.NDArray, Base]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._ldata:
+            return self._ldata[name]
+        elif name in self._partial:
+            return self._partial[name]
+        elif name in self.constructs.cols() and self._has_col(name):
+            svar, i = self.constructs.lookup(name)
+            return self.__getattr__(svar).data[:, i]
+        elif name in self._cdata:
+            return wrap(self.constructs.data[name].obj, self._cdata[name])
+        elif name in self._pending:
+            return wrap(self.constructs.data[name].obj, self._derive(name))
         else:
             raise AttributeError(f"Unknown column or construct {name}")
 
+    @property
+    def data(self) -> pd.DataFrame:
+        """A pandas view of the table, built on first access."""
+        if self._data is None:
+            self._derive_all()
+            cols = {}
+            for svar in self.constructs:
+                if svar.name in self._cdata:
+                    cols.update({k: self._cdata[svar.name][:, i] for i, k in enumerate(svar.keys)})
+                else:
+                    cols.update({k: self._partial[k] for k in svar.keys if k in self._partial})
+            self._data = pd.DataFrame(
+                dict(**cols, **self._ldata), 
+                index=pd.Index(self._index, name="t")
+            )
+        return self._data
+
     def to_csv(self, filename):
         self.data.to_csv(filename)
         return filename
 
-    def to_dict(self):
-        return self.data.to_dict(orient="records")
+    def save(self, file: str) -> str:
+        """Write the table to a binary columnar file (see flightanalysis.base.archive), 
+        label columns are dictionary encoded and the runs of constant labels are indexed."""
+        self._derive_all()
+        arrays = dict(
+            index=self._index,
+            **{f"construct/{k}": v for k, v in self._cdata.items()},
+            **{f"partial/{k}": v for k, v in self._partial.items()},
+        )
+        labels = {}
+        change = np.zeros(len(self) - 1, dtype=bool)
+        for k, v in self._ldata.items():
+            codes, categories = pd.factorize(v)
+            arrays[f"label/{k}"] = codes.astype(np.int32)
+            labels[k] = [c.item() if isinstance(c, np.generic) else c for c in categories]
+            change |= codes[1:] != codes[:-1]
+        
+        # the runs of constant labels, so TableFile can find a label without reading them all
+        starts = np.concatenate([[0], np.flatnonzero(change) + 1])
+        arrays["runs/start"] = starts
+        for k in self._ldata.keys():
+            arrays[f"runs/{k}"] = arrays[f"label/{k}"][starts]
+        return write_arrays(file, arrays, dict(kind=self.__class__.__name__, labels=labels))
+
+    @classmethod
+    def open(Cls, file: str):
+        """Open a file written by save for reading parts of the table, see TableFile."""
+        from .table_file import TableFile
+        return TableFile(file, Cls)
+
+    @classmethod
+    def load(Cls, file: str, mmap: bool=True) -> Self:
+        """Read a table written by save.
+
+        Args:
+            mmap (bool): memory map the construct data rather than reading it into memory. 
+                Defaults to True.
+        """
+        arrays, meta = read_arrays(file, mmap)
+        ldata = {}
+        for k, categories in meta["labels"].items():
+            ldata[k] = np.array(categories + [np.nan], dtype=object)[arrays[f"label/{k}"]]
+        return Cls.__new__(Cls)._setup(
+            {k[10:]: v for k, v in arrays.items() if k.startswith("construct/")},
+            {k[8:]: v for k, v in arrays.items() if k.startswith("partial/")},
+            ldata,
+            arrays["index"],
+            False, True, False
+        )
+
+    def to_dict(self, compact: bool=False, dtype: str="float64", delta: bool=False, compress: bool=False) -> Union[list, dict]:
+        """Convert to a list of records, or if compact a dict of columns with the labels run length encoded.
+
+        Args:
+            compact (bool): use the columnar encoding, the other arguments only apply if this is set.
+            dtype (str): dtype to store the columns as, see flightanalysis.base.encoding.encode_array.
+            delta (bool): delta encode the columns.
+            compress (bool): zlib compress the columns.
+        """
+        if not compact:
+            return self.data.to_dict(orient="records")
+        self._derive_all()
+        return dict(
+            columns={c: encode_array(self.__getattr__(c), dtype, delta, compress) for c in self.base_cols},
+            labels={k: encode_runs(v) for k, v in self._ldata.items()}
+        )
     
     @classmethod
-    def from_dict(Cls, data):
+    def from_dict(Cls, data: Union[list, dict]):
+        if isinstance(data, dict) and "columns" in data:
+            data = dict(
+                **{k: decode_array(v) for k, v in data["columns"].items()},
+                **{k: decode_runs(v) for k, v in data["labels"].items()}
+            )
         return Cls(pd.DataFrame.from_dict(data).set_index("t", drop=False))
 
     def __len__(self):
-        return len(self.data)
+        return len(self._index)
     
     @property
     def duration(self):
-        return self.data.index[-1] - self.data.index[0]
+        return self._index[-1] - self._index[0]
 
     def __getitem__(self, sli):
         if isinstance(sli, Number):
             if sli<0:
-                return self.__class__(self.data.iloc[[int(sli)], :])
-
-            return self.__class__(
-                self.data.iloc[self.data.index.get_indexer([sli], method="nearest"), :]
-            )
+                return self._row(int(sli))
+            return self._row(self._nearest(sli))
         
         return self.__class__(self.data.loc[sli])
 
+    def _nearest(self, t: float) -> int:
+        """The row with the index closest to t, ties go to the later row as for pandas get_indexer"""
+        i = int(np.searchsorted(self._index, t))
+        if i == len(self) or (i > 0 and t - self._index[i-1] < self._index[i] - t):
+            return i - 1
+        return i
+
+    def _row(self, i: int) -> Self:
+        """Row i as a single row table that shares memory with this one"""
+        self._derive_all()
+        i = range(len(self))[i]
+        return self.__class__.__new__(self.__class__)._setup(
+            {k: v[i:i+1] for k, v in self._cdata.items()},
+            {k: v[i:i+1] for k, v in self._partial.items()},
+            {k: v[i:i+1] for k, v in self._ldata.items()},
+            np.zeros(1), True, True, False
+        )
+
     def slice_raw_t(self, sli):
         inds = self.data.reset_index(names="t2").set_index("t").loc[sli].t2.to_numpy()#set_index("t", drop=False).columns
 
         return self.__class__(self.data.loc[inds])
         
     def __iter__(self):
-        for ind in list(self.data.index):
-            yield self[ind]
+        for i in range(len(self)):
+            yield self._row(i)
 
     @classmethod
     def from_constructs(cls, *args,**kwargs):
@@ -128,31 +365,26 @@ class Table:
             **kwargs
         )
 
-        df = pd.concat(
-            [
-                x.to_pandas(
-                    columns=cls.constructs[key].keys, 
-                    index=kwargs["time"].t
-                ) for key, x in kwargs.items() if not x is None
-            ],
-            axis=1
+        return cls._from_arrays(
+            {cls.constructs[key].name: np.array(x.data, dtype=float, order="C") for key, x in kwargs.items() if not x is None}
         )
 
-        return cls(df)
-
     def __repr__(self):
         return f"{self.__class__.__name__} Table(duration = {self.duration})"
 
     def copy(self, *args,**kwargs):
         kwargs = dict(kwargs, **{list(self.constructs.data.keys())[i]: arg for i, arg in enumerate(args)}) # add the args to the kwargs
-        old_constructs = {key: self.__getattr__(key) for key in self.constructs.existing(self.data.columns).data if not key in kwargs}       
+        for key in [k for k in self._pending if not k in kwargs]:
+            if key in self._pending: # so the result does not depend on which constructs have been read
+                self._derive(key)
+        old_constructs = {key: self.__getattr__(key) for key in self._cdata if not key in kwargs}       
         new_constructs = {key: value for key, value in list(kwargs.items()) + list(old_constructs.items())}
-        return self.__class__.from_constructs(**new_constructs).label(**self.labels.to_dict(orient='list'))
+        return self.__class__.from_constructs(**new_constructs).label(**self._ldata)
 
     def append(self, other, timeoption:str="dt"):
         if timeoption in ["now", "t"]:
             t = np.array([time()]) if timeoption == "now" else other.t
-            dt = other.dt
+            dt = other.dt.copy()
             dt[0] = t[0] - self.t[-1]
             new_time = Time(t, dt)
         elif timeoption == "dt":
@@ -168,44 +400,109 @@ class Table:
         ).set_index("t", drop=False))
 
     def label(self, **kwargs) -> Self:
-        return self.__class__(self.data.assign(**kwargs))
+        ldata = dict(**self._ldata)
+        for k, v in kwargs.items():
+            if isinstance(v, pd.Series):
+                v = v.to_numpy()
+            v = np.full(len(self), v, dtype=object) if np.ndim(v) == 0 else np.asarray(v)
+            if v.dtype.kind in "US":
+                v = v.astype(object)
+            if not len(v) == len(self):
+                raise ValueError(f"Length of label {k} ({len(v)}) does not match length of table ({len(self)})")
+            ldata[k] = v
+        return self._relabel(ldata)
 
     @property
     def label_keys(self):
         return self.label_cols
     
     @property
-    def labels(self) -> dict[str, npt.NDArray]:
-        return self.data.loc[:, self.label_cols]
+    def labels(self) -> pd.DataFrame:
+        return pd.DataFrame(self._ldata, index=pd.Index(self._index, name="t"), columns=self.label_cols)
 
     def remove_labels(self) -> Self:
-        return self.__class__(
-            self.data.drop(
-                self.label_keys, 
-                axis=1, 
-                errors="ignore"
-            )
+        return self._relabel({})
+
+    def _relabel(self, ldata: Dict[str, npt.NDArray]) -> Self:
+        """A new table sharing the construct data of this one with different labels."""
+        return self.__class__.__new__(self.__class__)._setup(
+            self._cdata, dict(**self._partial), ldata, self._index, True, True
         )
     
+    def _label_index(self, cols: list[str]=None) -> tuple[pd.DataFrame, dict[tuple, int]]:
+        """The unique combinations of the labels in cols in order of appearance, with the first (start)
+        and last (end) row they occur in and their number of rows (len). Also returns a lookup from 
+        the label values to the row of the index.
+        Built in one pass over the runs of constant labels and cached, as the labels of a Table never change.
+        """
+        cols = tuple(self.label_cols if cols is None else cols)
+        if not cols in self._lindex:
+            change = np.zeros(len(self) - 1, dtype=bool)
+            for c in cols:
+                change |= self._ldata[c][1:] != self._ldata[c][:-1]
+            starts = np.concatenate([[0], np.flatnonzero(change) + 1])
+            ends = np.append(starts[1:], len(self)) - 1
+            runs = pd.DataFrame(dict(
+                **{c: self._ldata[c][starts] for c in cols}, 
+                start=starts, end=ends, len=ends - starts + 1
+            ))
+            index = runs.groupby(list(cols), sort=False, dropna=False).agg(
+                start=("start", "min"), end=("end", "max"), len=("len", "sum")
+            ).reset_index()
+            lookup = {tuple(r): i for i, r in enumerate(index.loc[:, list(cols)].itertuples(index=False))}
+            self._lindex[cols] = (index, lookup)
+        return self._lindex[cols]
+
+    def _label_row(self, **kwargs) -> Union[tuple[int, int, int], None]:
+        """start, end and len of the rows with the labels given in kwargs, None if there are none"""
+        index, lookup = self._label_index(list(kwargs.keys()))
+        i = lookup.get(tuple(kwargs.values()))
+        return None if i is None else tuple(index.loc[i, ["start", "end", "len"]].astype(int))
+
+    def _slice_rows(self, start: int, stop: int, min_len: int=1) -> Self:
+        """A table over rows start:stop that shares memory with this one. The arrays are
+        read only, so anything that changes the data builds new ones and the view behaves as a copy."""
+        if stop - start < min_len:
+            raise Exception(f"State constructor length check failed, data length = {stop - start}, min_len = {min_len}")
+        self._derive_all()
+        return self.__class__.__new__(self.__class__)._setup(
+            {k: v[start:stop] for k, v in self._cdata.items()},
+            {k: v[start:stop] for k, v in self._partial.items()},
+            {k: v[start:stop] for k, v in self._ldata.items()},
+            self._index[start:stop] - self._index[start],
+            False, True, False
+        )
+
     def get_subset_df(self, **kwargs) -> pd.DataFrame:
+        if len(kwargs) > 0 and all(k in self._ldata for k in kwargs):
+            rng = self._label_row(**kwargs)
+            if rng is None:
+                return self.data.iloc[:0]
+            elif rng[2] == rng[1] - rng[0] + 1:
+                return self.data.iloc[rng[0]:rng[1] + 1]
         dfo = self.data
         for k, v in kwargs.items():
             dfo = dfo.loc[dfo[k] == v, :]            
         return dfo
 
     def get_label_subset(self, min_len=1, **kwargs) -> Self:
+        if len(kwargs) > 0 and all(k in self._ldata for k in kwargs):
+            rng = self._label_row(**kwargs)
+            if not rng is None and rng[2] == rng[1] - rng[0] + 1:
+                return self._slice_rows(rng[0], rng[1] + 1, min_len)
         return self.__class__(self.get_subset_df(**kwargs), min_len=min_len)
 
     def get_label_len(self, **kwargs) -> int:
         try:
-            return len(self.get_subset_df(**kwargs))
+            rng = self._label_row(**kwargs)
         except Exception:
             return 0
+        return 0 if rng is None else rng[2]
 
     def unique_labels(self, cols = None) -> pd.DataFrame:
         if cols is None:
             cols = self.label_cols
-        return self.data.loc[:, cols].reset_index(drop=True).drop_duplicates().reset_index(drop=True)
+        return self._label_index(cols)[0].loc[:, cols]
 
     def shift_labels(self, col, elname, offset, allow_label_loss=True) -> Self:
         """Move the end of a label forwards or backwards by offset seconds.
@@ -252,34 +549,36 @@ class Table:
     
     def get_label_id(self, **kwargs) -> Union[int, float]:
         dfo = self.unique_labels()
-        for k, v in kwargs.items():
-            dfo = dfo.loc[dfo[k] == v, :]            
-        return dfo.index[0]
+        mask = np.all([dfo[k].to_numpy() == v for k, v in kwargs.items()], axis=0)
+        return dfo.index[mask][0]
     
     def label_range(self, t=False, **kwargs) -> tuple[int]:
         '''Get the first and last index of a label. 
             If t is True this gives the time, if False it gives the index'''
-        labs = self.get_subset_df(**kwargs)
+        rng = self._label_row(**kwargs)
+        if rng is None:
+            raise KeyError(f"No rows labelled {kwargs}")
         if not t:
-            return self.data.index.get_indexer([labs.index[0]])[0], self.data.index.get_indexer([labs.index[-1]])[0]
+            return rng[0], rng[1]
         else:
-            return labs.index[0], labs.index[-1]
+            return self._index[rng[0]], self._index[rng[1]]
 
     def label_ranges(self, cols: list[str] = None, t=False) -> pd.DataFrame:
         '''get the first and last index for each unique label'''
         if cols is None:
             cols = self.label_cols
-        df: pd.DataFrame = self.unique_labels(cols)
-        res = []
-        for row in df.iterrows():
-            res.append(list(self.label_range(t=t,**row[1].to_dict())))
-        return pd.concat([df, pd.DataFrame(res, columns=['start', 'end'])], axis=1)
+        df = self._label_index(cols)[0].loc[:, list(cols) + ["start", "end"]]
+        if t:
+            df["start"] = self._index[df.start]
+            df["end"] = self._index[df.end]
+        return df
 
     def single_labels(self) -> list[str]:
         return ['_'.join(r[1]) for r in self.data.loc[:, self.label_cols].iterrows()]
 
     def label_lens(self) -> dict[str, int]:
-        return {k: len(v) for k, v in self.split_labels().items()}
+        index = self._label_index()[0]
+        return {'_'.join(r[:-1]): r[-1] for r in index.loc[:, self.label_cols + ["len"]].itertuples(index=False)}
 
     def extract_single_label(self, lab) -> Self:
         labs = np.array(self.single_labels())
@@ -287,11 +586,10 @@ class Table:
 
     def split_labels(self) -> dict[str, Self]:
         '''split into multiple tables based on the labels'''
-        res = {}
-        for l in self.unique_labels().iterrows():
-            ld = l[1].to_dict()
-            res['_'.join(ld.values())] = self.get_label_subset(**ld)
-        return res
+        return {
+            '_'.join(ld.values()): self.get_label_subset(**ld) 
+            for ld in self.unique_labels().to_dict(orient="records")
+        }
 
     @staticmethod
     def copy_labels(template: Self, flown: Self, path=None, min_len=0) -> Self:
@@ -300,6 +598,8 @@ class Table:
         flown = flown.remove_labels()
 
         if path is None:
+            if len(flown) == len(template):
+                return flown.label(**template._ldata)
             return flown.__class__(
                 pd.concat(
                     [flown.data.reset_index(drop=True), template.data.loc[:,template.label_cols].reset_index(drop=True)], 
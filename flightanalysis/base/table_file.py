@@ -0,0 +1,119 @@
+from __future__ import annotations
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pathlib import Path
+from typing import Union, List, Tuple, Type
+from pandas.api.types import is_list_like
+from .archive import read_header
+from .table import Table
+
+
+class TableFile:
+    """Random access to a table written by Table.save.
+
+    Nothing is read until it is asked for. The label index saved with the table gives the
+    rows of each label, then only those rows are read from the file, so sweeping an archive
+    for one manoeuvre per flight keeps memory use flat.
+    """
+    def __init__(self, file: Union[str, Path], Cls: Type[Table]=Table):
+        self.file = file
+        self.Cls = Cls
+        header, self._start = read_header(file)
+        self._arrays = header["arrays"]
+        self.meta = header["meta"]
+        self.label_cols = list(self.meta["labels"].keys())
+        self._runs = None
+
+    def __len__(self):
+        return self._arrays["index"]["shape"][0]
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.file}, {self.Cls.__name__}, length = {len(self)})"
+
+    def _read(self, name: str, start: int, stop: int) -> npt.NDArray:
+        """Read rows start:stop of an array into memory"""
+        info = self._arrays[name]
+        dtype = np.dtype(info["dtype"])
+        shape = (stop - start, *info["shape"][1:])
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        row_bytes = dtype.itemsize * int(np.prod(info["shape"][1:]))
+        return np.array(np.memmap(
+            self.file, dtype=dtype, mode="r", shape=shape,
+            offset=self._start + info["offset"] + start * row_bytes
+        ))
+
+    def _decode(self, col: str, codes: npt.NDArray) -> npt.NDArray:
+        return np.array(self.meta["labels"][col] + [np.nan], dtype=object)[codes]
+
+    @property
+    def runs(self) -> pd.DataFrame:
+        """The runs of constant labels, with their first (start) and last (end) row"""
+        if self._runs is None:
+            if "runs/start" in self._arrays:
+                starts = self._read("runs/start", 0, self._arrays["runs/start"]["shape"][0])
+                labels = {c: self._decode(c, self._read(f"runs/{c}", 0, len(starts))) for c in self.label_cols}
+            else:
+                codes = {c: self._read(f"label/{c}", 0, len(self)) for c in self.label_cols}
+                change = np.zeros(len(self) - 1, dtype=bool)
+                for c in self.label_cols:
+                    change |= codes[c][1:] != codes[c][:-1]
+                starts = np.concatenate([[0], np.flatnonzero(change) + 1])
+                labels = {c: self._decode(c, codes[c][starts]) for c in self.label_cols}
+            self._runs = pd.DataFrame(dict(
+                **labels, start=starts, end=np.append(starts[1:], len(self)) - 1
+            ))
+        return self._runs
+
+    def read(self, ranges: List[Tuple[int, int]]=None) -> Table:
+        """Read the rows in a list of (start, stop) ranges, defaults to the whole table"""
+        if ranges is None:
+            ranges = [(0, len(self))]
+
+        def get(name: str) -> npt.NDArray:
+            return np.concatenate([self._read(name, start, stop) for start, stop in ranges])
+
+        index = get("index")
+        return self.Cls.__new__(self.Cls)._setup(
+            {k[10:]: get(k) for k in self._arrays if k.startswith("construct/")},
+            {k[8:]: get(k) for k in self._arrays if k.startswith("partial/")},
+            {c: self._decode(c, get(f"label/{c}")) for c in self.label_cols},
+            index - index[0],
+            False, True, False
+        )
+
+    def get_subset(self, selection: Union[list, str, int, slice], col: str="manoeuvre", min_len: int=1) -> Table:
+        """Read the rows with the labels in selection, which works as for State.get_subset"""
+        runs = self.runs
+        selectors = pd.unique(runs.loc[:, col])
+        if isinstance(selection, slice):
+            selection = selectors[selection]
+        if not is_list_like(selection):
+            selection = [selection]
+        selection = [selectors[s] if isinstance(s, int) else s for s in selection]
+
+        runs = runs.loc[runs.loc[:, col].isin(selection)]
+        starts, stops = runs.start.to_numpy(), runs.end.to_numpy() + 1
+        joined = np.append(starts[1:] == stops[:-1], False) # merge runs that follow on
+        ranges = list(zip(
+            starts[np.append(True, ~joined[:-1])].tolist(), 
+            stops[~joined].tolist()
+        )) if len(runs) > 0 else []
+        length = sum(stop - start for start, stop in ranges)
+        if length < min_len:
+            raise Exception(f"State constructor length check failed, data length = {length}, min_len = {min_len}")
+        return self.read(ranges)
+
+    def get_manoeuvre(self, manoeuvre: Union[str, list, int]) -> Table:
+        return self.get_subset(manoeuvre, "manoeuvre")
+
+    def get_element(self, element: Union[str, list, int]) -> Table:
+        return self.get_subset(element, "element")
+
+    def get_meid(self, manid: int, elid: int=None) -> Table:
+        st = self.get_manoeuvre(manid)
+        if not elid is None:
+            return st.get_element(elid)
+        else:
+            return st
@@ -18,12 +18,16 @@ from flightanalysis.schedule.elements import Line, Elements
 from flightanalysis.schedule.manoeuvre import Manoeuvre
 from flightanalysis.schedule.definition.manoeuvre_info import ManInfo
 from flightanalysis import State
-from geometry import Transformation, Euler, Point, P0
+from geometry import Transformation, Euler, Point, P0, PX, Quaternion
 from functools import partial
+from collections import OrderedDict
 from . import ManParm, ManParms, ElDef, ElDefs, _a, Position, Direction
 from copy import deepcopy
 
 
+_templates: OrderedDict[tuple, State] = OrderedDict() # see ManDef.elements_template
+
+
 class ManDef:
     """This is a class to define a manoeuvre for template generation and judging.
 
@@ -31,6 +35,8 @@ class ManDef:
     of elements.
     """
 
+    template_cache_size = 64
+
     def __init__(self, info: ManInfo, mps: ManParms = None, eds: ElDefs = None):
         self.info: ManInfo = info
         self.mps: ManParms = ManParms.create_defaults_f3a() if mps is None else mps
@@ -73,11 +79,7 @@ class ManDef:
 
         #Create a template, at zero
         man = self._create()
-        template = man.create_template(
-            State.from_transform(Transformation(
-                Point(0,0,0),
-                Euler(self.info.start.o.roll_angle(), 0, 0)
-        )))
+        template = self.elements_template(man.elements, Euler(self.info.start.o.roll_angle(), 0, 0))
           
         if self.info.position == Position.CENTRE:
             if len(self.info.centre_points) > 0:
@@ -117,6 +119,38 @@ class ManDef:
             uid=self.info.short_name
         )
 
+    def elements_template(self, elements: Elements, att: Quaternion) -> State:
+        """Create the template for a set of elements starting at the origin with attitude att.
+
+        For a given set of elements and initial attitude the template only differs by a translation,
+        so the most recently used ones are cached.
+        """
+        key = (tuple(repr(el) for el in elements), tuple(np.round(att.data[0], 9)))
+        if key in _templates:
+            _templates.move_to_end(key)
+        else:
+            tp = Manoeuvre(None, elements, None, self.info.short_name).create_template(
+                State.from_transform(Transformation(P0(), att), vel=PX())
+            )
+            # only the element label, so it stacks with the entry and exit lines without pandas
+            _templates[key] = tp.remove_labels().label(element=tp.element)
+            if len(_templates) > ManDef.template_cache_size:
+                _templates.popitem(last=False)
+        return _templates[key]
+
+    def create_template(self, itrans: Transformation) -> Tuple[Manoeuvre, State]:
+        """Create the manoeuvre with entry and exit lines and its template, the template of the 
+        elements is relocated from the cache.
+
+        Returns:
+            Tuple[Manoeuvre, State]: The manoeuvre and the template
+        """
+        man = self.create(itrans).add_lines()
+        entry = man.entry_line.create_template(State.from_transform(itrans, vel=PX()))
+        els = self.elements_template(man.elements, itrans.att).relocate(entry.pos[-1])
+        exit = man.exit_line.create_template(els[-1])
+        return man, State.stack([entry, els, exit], manoeuvre=man.uid)
+
     def _create(self) -> Manoeuvre:
         return Manoeuvre(
             None,
@@ -114,6 +114,13 @@ class ManParm(Opp):
             return lambda mps: mps.data[self.name].value 
     
 
+    def __call__(self, mps, **kwargs):
+        # read the value from the collection passed in, so expressions built from this ManParm 
+        # follow the defaults of a copied ManParms
+        if isinstance(mps, ManParms) and self.name in mps.data:
+            return mps.data[self.name].value
+        return self.value
+
     def copy(self):
         return ManParm(name=self.name, criteria=self.criteria, default=self.default, collectors=self.collectors.copy())
 
@@ -16,6 +16,8 @@ class Opp:
         if name == "name":
             self.name = uuid1() 
             return self.name
+        elif name.startswith("__"):
+            raise AttributeError(name) # so the pickle and copy protocols are not hijacked
 
     def __str__(self):
         return self.name 
@@ -8,6 +8,8 @@ from flightanalysis.base.collection import Collection
 from json import dump, load
 from flightanalysis.base.numpy_encoder import NumpyEncoder
 from dataclasses import dataclass
+from functools import lru_cache
+from copy import copy
 from flightanalysis.data import list_resources, get_json_resource
 
 
@@ -71,6 +73,12 @@ class SchedDef(Collection):
             mans.append(man)
         return Schedule(mans), State.stack(templates)
 
+    def segment(self, state: State, wind: int=1) -> State:
+        """Label the manoeuvres in a whole flight by finding the schedule template within it. 
+        An alternative to the splitter information in a FlightCoach json. The flight before 
+        and after the schedule is labelled tkoff and land."""
+        return State.segment(state, self.create_template(170, wind)[1])
+
     def create_el_matched_template(self, intended: Schedule):
         for md, man in zip(self, intended):
             if isinstance(man, Line):
@@ -93,9 +101,15 @@ class SchedDef(Collection):
         
     @staticmethod
     def load(name: Union[str,ScheduleInfo]) -> Self:
+        """Load a schedule definition from the package resources. 
+        Parsed definitions are cached. Each call gets its own copy of each ManParm, as the defaults 
+        are updated during analysis. The ManInfo and ElDefs are shared with the cached definition."""
         if isinstance(name, ScheduleInfo):
             name = str(name)
-        return SchedDef.from_dict(get_json_resource(f"{name.lower()}_schedule"))
+        return SchedDef([
+            ManDef(md.info, ManParms([copy(mp) for mp in md.mps]), md.eds) 
+            for md in _load_resource(name.lower())
+        ])
     
 
     def plot(self):
@@ -116,3 +130,8 @@ class SchedDef(Collection):
         fcj = template.scale(scale).create_fc_json(self, sname)
         with open(path, 'w') as f:
             dump(fcj, f)
+
+
+@lru_cache(maxsize=32)
+def _load_resource(name: str) -> SchedDef:
+    return SchedDef.from_dict(get_json_resource(f"{name}_schedule"))
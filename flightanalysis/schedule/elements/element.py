@@ -3,7 +3,7 @@ import numpy as np
 import pandas as pd
 from flightanalysis import State, Collection, Time
 from flightanalysis.schedule.scoring.criteria.f3a_criteria import F3A
-from flightanalysis.schedule.scoring import Measurement, DownGrade, DownGrades, Result, Results
+from flightanalysis.schedule.scoring import Measurement, Samples, DownGrade, DownGrades, Result, Results
 from geometry import Transformation, PX, PY, PZ, Point, angle_diff, Coord, Quaternion
 from json import load, dumps
 import inspect
@@ -58,15 +58,21 @@ class Element:
     def score_series_builder(self, index):
         return lambda data: pd.Series(data, index=index)
 
-    def analyse(self, flown:State, template:State) -> Results:
+    def analyse(self, flown:State, template:State, samples: Samples=None) -> Results:
 #        fl =  self.setup_analysis_state(flown, template)
 #        tp =  self.setup_analysis_state(template, template)
-        return self.intra_scoring.apply(self, flown, template, self.ref_frame(template))
+        return self.intra_scoring.apply(self, flown, template, self.ref_frame(template), samples)
 
-    def analyse_exit(self, fl, tp) -> Results:
+    def analyse_exit(self, fl, tp, samples: Samples=None) -> Results:
         #fl =  self.setup_analysis_state(flown, template)
         #tp =  self.setup_analysis_state(template, template)
-        return self.exit_scoring.apply(self, fl, tp, self.ref_frame(tp))
+        return self.exit_scoring.apply(self, fl, tp, self.ref_frame(tp), samples)
+
+    def rescore(self, results: Results) -> Results:
+        return self.intra_scoring.rescore(self, results)
+
+    def rescore_exit(self, results: Results) -> Results:
+        return self.exit_scoring.rescore(self, results)
 
     def ref_frame(self, template: State) -> Transformation:
         return template[0].transform
@@ -53,12 +53,10 @@ class Line(Element):
         """
         v = PX(self.speed) if istate.vel == 0 else istate.vel.scale(self.speed)
              
-        return self._add_rolls(
-            istate.copy(vel=v, rvel=P0()).fill(
-                Element.create_time(self.length / self.speed, time)
-            ), 
+        return istate.copy(vel=v, rvel=P0()).fill_arc(
+            Element.create_time(self.length / self.speed, time), 
             self.roll
-        )
+        ).label(element=self.uid)
 
     def match_axis_rate(self, roll_rate: float) -> Line:
         # roll rate in radians per second
@@ -63,15 +63,13 @@ class Loop(Element):
         
         v = PX(self.speed) if istate.vel == 0 else istate.vel.scale(self.speed)
         
-        return self._add_rolls(
-            istate.copy(
-                vel=v,
-                rvel=PZ(self.angle / duration) if self.ke else PY(self.angle / duration)
-            ).fill(
-                Element.create_time(duration, time)
-            ), 
+        return istate.copy(
+            vel=v,
+            rvel=PZ(self.angle / duration) if self.ke else PY(self.angle / duration)
+        ).fill_arc(
+            Element.create_time(duration, time), 
             self.roll
-        )
+        ).label(element=self.uid)
 
     def measure_radius(self, itrans: Transformation, flown:State):
         """The radius vector in m given a state in the loop coordinate frame"""
@@ -75,7 +75,8 @@ class Manoeuvre:
         )
     
     def create_template(self, initial: Union[Transformation, State], aligned:State=None) -> State:
-        
+        """Create each element's template starting from the last row of the previous one, 
+        then write them all into one State with State.stack."""
         istate = State.from_transform(initial, vel=PX()) if isinstance(initial, Transformation) else initial
         aligned = self.get_data(aligned) if aligned else None
         templates = []
@@ -88,7 +89,7 @@ class Manoeuvre:
             templates.append(element.create_template(istate, time))
             istate = templates[-1][-1]
         
-        return State.stack(templates).label(manoeuvre=self.uid)
+        return State.stack(templates, manoeuvre=self.uid)
 
 
     def get_data(self, st: State) -> State:
@@ -142,17 +143,34 @@ class Manoeuvre:
         )
 
     def analyse(self, flown: State, template: State):
-        fl=self.entry_line.get_data(flown)
-        tp=self.entry_line.get_data(template).relocate(fl.pos[0])
-        
-        ers = [Results(self.entry_line.uid, self.entry_line.analyse_exit(fl, tp))]
+        # The per sample quantities shared by the measurements are worked out once for the 
+        # whole manoeuvre, then sliced for each element. This needs the rows of flown and template to match.
+        samples = Samples(flown, template) if len(flown) == len(template) else None
 
-        for el in self.elements:
+        def get_data(el):
             fl = el.get_data(flown)
             tp = el.get_data(template).relocate(fl.pos[0])
-            ers.append(Results(el.uid, el.analyse(fl, tp)))
+            if samples is None:
+                return fl, tp, None
+            rng = flown.label_range(element=el.uid)
+            if rng[1] - rng[0] + 1 != len(fl) or template.label_range(element=el.uid) != rng:
+                return fl, tp, None
+            return fl, tp, samples[rng[0]:rng[1]+1]
+
+        ers = [Results(self.entry_line.uid, self.entry_line.analyse_exit(*get_data(self.entry_line)))]
+
+        for el in self.elements:
+            ers.append(Results(el.uid, el.analyse(*get_data(el))))
         return ElementsResults(ers)
 
+    def rescore(self, ers: ElementsResults) -> ElementsResults:
+        """Apply the current criteria to the measurements in the results of analyse, 
+        without measuring the flight again."""
+        return ElementsResults(
+            [Results(self.entry_line.uid, self.entry_line.rescore_exit(ers[self.entry_line.uid]))] + \
+            [Results(el.uid, el.rescore(ers[el.uid])) for el in self.elements]
+        )
+
     def descriptions(self):
         return [e.describe() for e in self.elements]
     
@@ -1,5 +1,5 @@
 from .results import Result, Results
-from .measurement import Measurement
+from .measurement import Measurement, Samples
 from .results import Result, Results, ElementsResults
 from .criteria import *
 from .downgrade import DownGrade, DownGrades
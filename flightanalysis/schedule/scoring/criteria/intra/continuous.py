@@ -5,6 +5,7 @@ import pandas as pd
 from .. import Criteria
 from dataclasses import dataclass
 from geometry import Point
+from typing import Union, List, Tuple
 
 @dataclass
 class Continuous(Criteria):
@@ -13,13 +14,25 @@ class Continuous(Criteria):
     treats each separate increase (peak - trough) as a new error.
     """
     @staticmethod
-    def get_peak_locs(arr, rev=False):
-        increasing = np.sign(np.diff(np.abs(arr)))>0
-        last_downgrade = np.column_stack([increasing[:-1], increasing[1:]])
-        peaks = np.sum(last_downgrade.astype(int) * [10,1], axis=1) == (1 if rev else 10)
-        last_val = False if rev else increasing[-1]
-        first_val = increasing[0] if rev else False
-        return np.concatenate([np.array([first_val]), peaks, np.array([last_val])])
+    def get_peak_locs(arr, rev=False, lengths=None):
+        """Mask of the peaks (troughs if rev) of abs(arr) along the last axis. 
+        For a batch of series padded at the end lengths gives the length of each one."""
+        arr = np.asarray(arr)
+        n = arr.shape[-1]
+        lengths = np.full(arr.shape[:-1], n) if lengths is None else np.asarray(lengths)
+        increasing = np.sign(np.diff(np.abs(arr), axis=-1))>0
+        locs = np.zeros(arr.shape, dtype=bool)
+        if rev:
+            locs[..., 1:-1] = ~increasing[..., :-1] & increasing[..., 1:]
+            locs[..., 0] = increasing[..., 0]
+        else:
+            locs[..., 1:-1] = increasing[..., :-1] & ~increasing[..., 1:]
+        locs &= np.arange(n) < lengths[..., None] - 1
+        if not rev:
+            last = np.maximum(lengths - 1, 1)[..., None]
+            np.put_along_axis(locs, last, np.take_along_axis(increasing, last - 1, axis=-1), axis=-1)
+        locs[lengths < 2] = False # a row this short is all padding after its first sample
+        return locs
 
     @staticmethod
     def smooth_sample(values, window_width=10):
@@ -36,23 +49,60 @@ class Continuous(Criteria):
         else:
             raise ValueError('self.comparison must be "absolute" or "ratio"')
 
-    def __call__(self, ids: npt.ArrayLike, values: npt.ArrayLike):
-        data = np.array(values)
-        peak_locs = Continuous.get_peak_locs(data)
-        trough_locs = Continuous.get_peak_locs(data, True)
+    def batch(self, values: Union[npt.NDArray, List[npt.NDArray]], lengths: npt.ArrayLike=None) -> List[Tuple[npt.NDArray, npt.NDArray, npt.NDArray]]:
+        """Find the mistakes and downgrades for many series at once.
+
+        Args:
+            values (Union[npt.NDArray, List[npt.NDArray]]): a 2D array holding a series in each row,
+                padded at the end, or a list of 1D arrays.
+            lengths (npt.ArrayLike, optional): the length of each row of a padded array. Defaults to the full width.
+
+        Returns:
+            List[Tuple[npt.NDArray, npt.NDArray, npt.NDArray]]: the index of each downgrade, the mistakes
+                and the downgrades, for each series.
+        """
+        if isinstance(values, np.ndarray):
+            data = np.atleast_2d(values)
+            lengths = np.full(len(data), data.shape[1]) if lengths is None else np.asarray(lengths)
+        else:
+            lengths = np.array([len(v) for v in values])
+            data = np.full((len(values), lengths.max()), np.nan)
+            for i, v in enumerate(values):
+                data[i, :len(v)] = v
+
+        if data.shape[-1] < 2:
+            # too short for any peaks or troughs
+            return [(np.array([], dtype=int), np.array([]), np.array([])) for _ in range(len(data))]
+
+        peak_locs = Continuous.get_peak_locs(data, False, lengths)
+        trough_locs = Continuous.get_peak_locs(data, True, lengths)
 
         if self.comparison == 'absolute':
             #if absolute, we only care about increases in error, corrections are free
+            locs = peak_locs
             mistakes = np.abs(data[peak_locs] - data[trough_locs])
-            dgids = list(np.array(ids)[peak_locs])
         elif self.comparison == 'ratio':
-            #if ratio then all changes are downgraded
-            values = np.concatenate([[data[0]], data[peak_locs + trough_locs]])
-            mistakes = np.maximum(values[:-1], values[1:]) / np.minimum(values[:-1], values[1:]) - 1
-            dgids = list(np.array(ids)[peak_locs + trough_locs])# + [ids[-1]]
+            #if ratio then all changes are downgraded, starting from the first value of each series
+            locs = peak_locs | trough_locs
+            counts = locs.sum(axis=1) + 1
+            starts = np.cumsum(counts) - counts
+            changes = np.ones(counts.sum(), dtype=bool)
+            changes[starts] = False
+            values = np.empty(len(changes))
+            values[starts] = data[:, 0]
+            values[changes] = data[locs]
+            mistakes = (np.maximum(values[:-1], values[1:]) / np.minimum(values[:-1], values[1:]) - 1)[changes[1:]]
         else:
             raise ValueError(f'{self.comparison} not in [absolute, ratio]')
-        
+
         downgrades = self.lookup(mistakes)
+        splits = np.cumsum(locs.sum(axis=1))[:-1]
+        return list(zip(
+            np.split(np.nonzero(locs)[1], splits), 
+            np.split(mistakes, splits), 
+            np.split(downgrades, splits)
+        ))
 
-        return dgids, mistakes, downgrades
+    def __call__(self, ids: npt.ArrayLike, values: npt.ArrayLike):
+        locs, mistakes, downgrades = self.batch(np.array(values)[None, :])[0]
+        return list(np.array(ids)[locs]), mistakes, downgrades
@@ -1,14 +1,15 @@
 
 from flightanalysis.base import Collection
 from .criteria import Single, Continuous, Criteria
-from .measurement import Measurement
+from .measurement import Measurement, Samples
 from .results import Results, Result
 from typing import Callable
 from flightanalysis.state import State 
 from geometry import Coord
 from dataclasses import dataclass
 import numpy as np
-import pandas as pd
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
 
 from scipy.signal import butter, filtfilt
 
@@ -16,24 +17,35 @@ from scipy.signal import butter, filtfilt
 def butter_filter(data, cutoff):
     return filtfilt(*butter(2, cutoff / 15, btype='low', analog=False), data)
 
-def convolve(data, width):
-    kernel = np.ones(width) / width
-    l = len(data)
-    outd = np.full(l, np.nan)
-    conv = np.convolve(data, kernel, mode='valid')
-    ld = (len(data) - len(conv))/2
-    outd[int(np.ceil(ld)):-int(np.floor(ld))] = conv
-    return pd.Series(outd).ffill().bfill().to_numpy()
+def fill_nans(data: npt.NDArray) -> npt.NDArray:
+    """Forward fill then back fill nans along the last axis, as pd.Series.ffill().bfill(). 
+    2D arrays are treated as a batch of series, one per row."""
+    valid = ~np.isnan(data)
+    if valid.all():
+        return data
+    ids = np.where(valid, np.arange(data.shape[-1]), 0)
+    np.maximum.accumulate(ids, axis=-1, out=ids)
+    leading = ~np.logical_or.accumulate(valid, axis=-1)
+    ids = np.where(leading, np.argmax(valid, axis=-1)[..., None], ids)
+    return np.take_along_axis(data, ids, axis=-1)
 
 
-def remove_outliers(data, nstds = 1):
-    std = np.nanstd(data)
-    mean = np.nanmean(data)
-    data = data.copy()
+def convolve(data: npt.NDArray, width: int) -> npt.NDArray:
+    """moving average along the last axis, the ends are filled with the nearest average."""
+    conv = sliding_window_view(data, width, axis=-1) @ (np.ones(width) / width)
+    ld = (width - 1) / 2
+    outd = np.full(data.shape, np.nan)
+    outd[..., int(np.ceil(ld)):data.shape[-1] - int(np.floor(ld))] = conv
+    return fill_nans(outd)
 
-    data[abs(data - mean) > nstds * std] = np.nan
 
-    return pd.Series(data).ffill().bfill().to_numpy()
+def remove_outliers(data: npt.NDArray, nstds: float = 1) -> npt.NDArray:
+    """replace values more than nstds standard deviations from the mean with the
+    nearest inlier, along the last axis."""
+    std = np.nanstd(data, axis=-1, keepdims=True)
+    mean = np.nanmean(data, axis=-1, keepdims=True)
+    data = np.where(abs(data - mean) > nstds * std, np.nan, data)
+    return fill_nans(data)
 
 
 
@@ -56,16 +68,23 @@ class DownGrade:
     def name(self):
         return self.measure.__name__
     
-    def __call__(self, fl, tp, coord) -> Result:
+    def __call__(self, fl, tp, coord, samples: Samples=None) -> Result:
+        if isinstance(self.criteria, Single):
+            # only the last row is measured, cheaper than slicing it from samples for the whole manoeuvre
+            return self.score(self.measure(fl[-1], tp[-1], coord))
+        elif isinstance(self.criteria, Continuous):
+            return self.score(self.measure(fl, tp, coord, samples))
+        else:
+            raise TypeError(f'Expected a Criteria, got {self.criteria.__class__.__name__}')
         
+    def score(self, measurement: Measurement) -> Result:
+        """Apply the criteria to a measurement"""
         if isinstance(self.criteria, Single):
-            measurement = self.measure(fl[-1], tp[-1], coord)
             vals = self.criteria.prepare(measurement.value, measurement.expected)    
 
             id, error, dg = self.criteria([0], vals)
             dg = dg * measurement.visibility[id]
         elif isinstance(self.criteria, Continuous):
-            measurement = self.measure(fl, tp, coord)
             vals = self.criteria.prepare(
                 remove_outliers(measurement.value), 
                 measurement.expected
@@ -77,12 +96,12 @@ class DownGrade:
 
             endcut = 4 #min(3, int((len(vals) - 5) / 2))
             
-            tempvals = np.full(len(fl), np.mean(vals))
+            tempvals = np.full(len(measurement), np.mean(vals))
             tempvals[endcut:-endcut] = vals[endcut:-endcut]
-            tempvals = convolve(pd.Series(tempvals).ffill().bfill().to_numpy(), 10)
+            tempvals = convolve(fill_nans(tempvals), 10)
        
             id, error, dg = self.criteria(
-                list(range(len(fl))),#list(range(endcut,len(fl)-endcut)), 
+                list(range(len(measurement))),#list(range(endcut,len(fl)-endcut)), 
                 abs(tempvals)
             )
             vals = tempvals
@@ -103,6 +122,13 @@ class DownGrades(Collection):
     VType = DownGrade
     uid = "name"
 
-    def apply(self, el, fl, tp, coord) -> Results:
-        return Results(el.uid, [dg(fl, tp, coord) for dg in self])
+    def apply(self, el, fl, tp, coord, samples: Samples=None) -> Results:
+        """Measure and score the element. samples can be sliced from the Samples of the whole 
+        manoeuvre, otherwise they are created here so they are shared by all the DownGrades."""
+        samples = Samples(fl, tp) if samples is None else samples
+        return Results(el.uid, [dg(fl, tp, coord, samples) for dg in self])
+
+    def rescore(self, el, results: Results) -> Results:
+        """Apply the criteria again to the measurements taken by apply"""
+        return Results(el.uid, [self[r.name].score(r.measurement) for r in results])
        
\ No newline at end of file
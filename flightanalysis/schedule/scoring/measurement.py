@@ -4,10 +4,100 @@ from geometry import Point, Coord, Quaternion, PX, PY, PZ, P0, Transformation
 import numpy as np
 import numpy.typing as npt
 from dataclasses import dataclass
-from typing import Union, Any, Self
+from typing import Union, Any, Self, Tuple
 from flightanalysis.base import Table, Constructs
 
 
+class Samples:
+    """Per sample quantities used by several measurements. They only depend on the matching rows 
+    of the flown and template States, so they can be worked out once for a whole manoeuvre and 
+    sliced for each element. Each one is calculated on first access.
+    """
+    def __init__(self, fl: State, tp: State):
+        self.fl = fl
+        self.tp = tp
+        self._cache = {}
+        self._parent: Samples = None
+        self._sli: slice = None
+
+    def _memo(self, name, builder):
+        """builder takes the Samples to calculate the quantity for. A slice reads the quantity
+        from the Samples it was taken from, so it is only calculated once."""
+        if not name in self._cache:
+            if self._parent is None:
+                self._cache[name] = builder(self)
+            else:
+                self._cache[name] = Samples._slice(self._parent._memo(name, builder), self._sli)
+        return self._cache[name]
+
+    @property
+    def pos(self) -> Point:
+        """flown position"""
+        return self._memo("pos", lambda s: s.fl.pos)
+
+    @property
+    def fl_wvel(self) -> Point:
+        """flown velocity in the world frame"""
+        return self._memo("fl_wvel", lambda s: s.fl.att.transform_point(s.fl.vel))
+
+    @property
+    def tp_wvel(self) -> Point:
+        """template velocity in the world frame"""
+        return self._memo("tp_wvel", lambda s: s.tp.att.transform_point(s.tp.vel))
+
+    @property
+    def fl_speed(self) -> npt.NDArray:
+        return self._memo("fl_speed", lambda s: abs(s.fl.vel))
+
+    @property
+    def pos_vis(self) -> npt.NDArray:
+        return self._memo("pos_vis", lambda s: Measurement._pos_vis(s.fl.pos))
+
+    @property
+    def body_roll_error(self) -> Point:
+        return self._memo("body_roll_error", lambda s: Quaternion.body_axis_rates(s.tp.att, s.fl.att) * PX())
+
+    @property
+    def world_roll_error(self) -> Point:
+        return self._memo("world_roll_error", lambda s: s.fl.att.transform_point(s.body_roll_error))
+
+    @property
+    def roll_vis(self) -> Tuple[Point, npt.NDArray]:
+        return self._memo("roll_vis", lambda s: Measurement._roll_vis(s.fl.pos, s.fl.att, s.pos_vis))
+
+    def track(self, ref_frame: Transformation) -> Tuple[Point, Point, Tuple[Point, npt.NDArray]]:
+        """The flown velocity rejected from the template velocity in the ref_frame and in the world frame,
+        and the visibility of the error. Shared by track_y and track_z, stored for each ref_frame."""
+        def build(s: Samples):
+            tr = ref_frame.q.inverse()
+            fcvel = tr.transform_point(s.fl_wvel) #flown ref frame vel
+            tcvel = tr.transform_point(s.tp_wvel) # template ref frame vel
+            cverr = Point.vector_rejection(fcvel, tcvel)
+            wverr = ref_frame.q.transform_point(cverr)
+            return cverr, wverr, Measurement._vector_vis(wverr.unit(), s.pos, s.pos_vis)
+        return self._memo(("track", ref_frame.q.data.tobytes()), build)
+
+    def evaluate(self) -> Self:
+        """Calculate all the quantities"""
+        for name, value in vars(Samples).items():
+            if isinstance(value, property):
+                getattr(self, name)
+        return self
+
+    def __getitem__(self, sli: slice) -> Samples:
+        """The quantities for a range of rows. Nothing is calculated here, each quantity is 
+        sliced from this Samples when it is first used."""
+        res = Samples(None, None)
+        res._parent, res._sli = self, sli
+        return res
+
+    @staticmethod
+    def _slice(value, sli):
+        if isinstance(value, tuple):
+            return tuple(Samples._slice(v, sli) for v in value)
+        return value[sli]
+
+
 @dataclass()
 class Measurement:
     value: npt.NDArray
@@ -57,83 +147,83 @@ class Measurement:
         return abs(Point.vector_rejection(loc, PY())) / abs(loc)
 
     @staticmethod
-    def _vector_vis(direction: Point, loc: Point) -> Union[Point, npt.NDArray]:
+    def _vector_vis(direction: Point, loc: Point, pos_vis: npt.NDArray=None) -> Union[Point, npt.NDArray]:
         #a vector error is more visible if it is perpendicular to the viewing vector
         # 0 to np.pi, pi/2 gives max, 0&np.pi give min
-        return direction,  (1 - 0.8* np.abs(Point.cos_angle_between(loc, direction))) * Measurement._pos_vis(loc)
+        if pos_vis is None:
+            pos_vis = Measurement._pos_vis(loc)
+        return direction,  (1 - 0.8* np.abs(Point.cos_angle_between(loc, direction))) * pos_vis
 
     @staticmethod
-    def _roll_vis(loc: Point, att: Quaternion) -> Union[Point, npt.NDArray]:
+    def _roll_vis(loc: Point, att: Quaternion, pos_vis: npt.NDArray=None) -> Union[Point, npt.NDArray]:
         #a roll error is more visible if the movement of the wing tips is perpendicular to the view vector
         #the wing tips move in the local body Z axis
+        if pos_vis is None:
+            pos_vis = Measurement._pos_vis(loc)
         world_tip_movement_direction = att.transform_point(PZ()) 
-        return world_tip_movement_direction, (1-0.8*np.abs(Point.cos_angle_between(loc, world_tip_movement_direction))) * Measurement._pos_vis(loc)
+        return world_tip_movement_direction, (1-0.8*np.abs(Point.cos_angle_between(loc, world_tip_movement_direction))) * pos_vis
 
     @staticmethod
-    def _rad_vis(loc:Point, axial_dir: Point) -> Union[Point, npt.NDArray]:
+    def _rad_vis(loc:Point, axial_dir: Point, pos_vis: npt.NDArray=None) -> Union[Point, npt.NDArray]:
         #radial error more visible if axis is parallel to the view vector
-        return axial_dir, (0.2+0.8*np.abs(Point.cos_angle_between(loc, axial_dir))) * Measurement._pos_vis(loc)
+        if pos_vis is None:
+            pos_vis = Measurement._pos_vis(loc)
+        return axial_dir, (0.2+0.8*np.abs(Point.cos_angle_between(loc, axial_dir))) * pos_vis
 
     @staticmethod
-    def speed(fl: State, tp: State, ref_frame: Transformation) -> Self:
-        wvel = fl.att.transform_point(fl.vel) 
+    def speed(fl: State, tp: State, ref_frame: Transformation, samples: Samples=None) -> Self:
+        samples = Samples(fl, tp) if samples is None else samples
+        wvel = samples.fl_wvel
         spd = abs(wvel)
-        return Measurement(spd, np.mean(spd),*Measurement._vector_vis(wvel.unit(), fl.pos))
+        return Measurement(spd, np.mean(spd),*Measurement._vector_vis(wvel.unit(), fl.pos, samples.pos_vis))
     
     @staticmethod
-    def roll_angle(fl: State, tp: State, ref_frame: Transformation) -> Self:
+    def roll_angle(fl: State, tp: State, ref_frame: Transformation, samples: Samples=None) -> Self:
         """vector in the body X axis, length is equal to the roll angle difference from template"""
-        body_roll_error = Quaternion.body_axis_rates(tp.att, fl.att) * PX()
-        world_roll_error = fl.att.transform_point(body_roll_error)
+        samples = Samples(fl, tp) if samples is None else samples
+        body_roll_error = samples.body_roll_error
+        world_roll_error = samples.world_roll_error
 
         return Measurement(
             np.unwrap(abs(world_roll_error) * np.sign(body_roll_error.x)), 
             0, 
-            *Measurement._roll_vis(fl.pos, fl.att)
+            *samples.roll_vis
         )
 
     @staticmethod
-    def roll_rate(fl: State, tp: State, ref_frame: Transformation) -> Measurement:
+    def roll_rate(fl: State, tp: State, ref_frame: Transformation, samples: Samples=None) -> Measurement:
         """vector in the body X axis, length is equal to the roll rate"""
+        samples = Samples(fl, tp) if samples is None else samples
         wrvel = fl.att.transform_point(fl.p * PX())
-        return Measurement(abs(wrvel) * np.sign(fl.p), np.mean(fl.p), *Measurement._roll_vis(fl.pos, fl.att))
+        return Measurement(abs(wrvel) * np.sign(fl.p), np.mean(fl.p), *samples.roll_vis)
     
     @staticmethod
-    def track_y(fl: State, tp:State, ref_frame: Transformation) -> Measurement:
+    def track_y(fl: State, tp:State, ref_frame: Transformation, samples: Samples=None) -> Measurement:
         """angle error in the velocity vector about the coord y axis"""
-        tr = ref_frame.q.inverse()
-        
-        fcvel = tr.transform_point(fl.att.transform_point(fl.vel)) #flown ref frame vel
-        tcvel = tr.transform_point(tp.att.transform_point(tp.vel)) # template ref frame vel
-
-        cverr = Point.vector_rejection(fcvel, tcvel)
-        wverr = ref_frame.q.transform_point(cverr)
+        samples = Samples(fl, tp) if samples is None else samples
+        cverr, wverr, vis = samples.track(ref_frame)
 
-        angle_err = np.arcsin(cverr.y / abs(fl.vel) )
+        angle_err = np.arcsin(cverr.y / samples.fl_speed )
 
         wz_angle_err = fl.att.transform_point(PZ() * angle_err)
 
-        return Measurement(np.unwrap(abs(wz_angle_err) * np.sign(angle_err)), 0, *Measurement._vector_vis(wverr.unit(), fl.pos))
+        return Measurement(np.unwrap(abs(wz_angle_err) * np.sign(angle_err)), 0, *vis)
 
     @staticmethod
-    def track_z(fl: State, tp: State, ref_frame: Transformation) -> Measurement:
-        tr = ref_frame.q.inverse()
-        
-        fcvel = tr.transform_point(fl.att.transform_point(fl.vel)) #flown ref frame vel
-        tcvel = tr.transform_point(tp.att.transform_point(tp.vel)) # template ref frame vel
-
-        cverr = Point.vector_rejection(fcvel, tcvel)
-        wverr = ref_frame.q.transform_point(cverr)
+    def track_z(fl: State, tp: State, ref_frame: Transformation, samples: Samples=None) -> Measurement:
+        samples = Samples(fl, tp) if samples is None else samples
+        cverr, wverr, vis = samples.track(ref_frame)
 
-        angle_err = np.arcsin(cverr.z / abs(fl.vel) )
+        angle_err = np.arcsin(cverr.z / samples.fl_speed )
 
         wz_angle_err = fl.att.transform_point(PY() * angle_err)
 
-        return Measurement(np.unwrap(abs(wz_angle_err) * np.sign(angle_err)), 0, *Measurement._vector_vis(wverr.unit(), fl.pos))
+        return Measurement(np.unwrap(abs(wz_angle_err) * np.sign(angle_err)), 0, *vis)
 
     @staticmethod
-    def radius(fl:State, tp:State, ref_frame: Transformation) -> Measurement:
+    def radius(fl:State, tp:State, ref_frame: Transformation, samples: Samples=None) -> Measurement:
         """error in radius as a vector in the radial direction"""
+        samples = Samples(fl, tp) if samples is None else samples
         flrad = fl.arc_centre() 
 
         fl_loop_centre = fl.body_to_world(flrad)  # centre of loop in world frame
@@ -155,6 +245,7 @@ class Measurement:
             ab, np.mean(ab), 
             *Measurement._rad_vis(
                 fl.pos, 
-                ref_frame.att.transform_point(loop_plane)
+                ref_frame.att.transform_point(loop_plane),
+                samples.pos_vis
             )  
         )
\ No newline at end of file
@@ -166,7 +166,7 @@ class ElementsResults(Collection):
         )
 
     @staticmethod
-    def from_dict(data) -> Results:
-        return Results(
-            [Result.from_dict(v) for v in data['data'].values()]
+    def from_dict(data) -> ElementsResults:
+        return ElementsResults(
+            [Results.from_dict(v) for v in data['data'].values()]
         )
@@ -1,3 +1,2 @@
-
 from .state import State
-
+from .stream import StateStream
@@ -3,10 +3,54 @@ from typing import Union, List, Tuple, Self
 import warnings
 from pathlib import Path
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from pandas.api.types import is_list_like
+from scipy.signal import butter, filtfilt
 from geometry import Point, Quaternion, Transformation, PX, PY, PZ, P0, Q0, Coord, GPS, Euler
 from flightanalysis import Table, Constructs, SVar, Time, Box, Flow, Environment
+from flightanalysis.base.dtw import dtw, sakoe_chiba_window, subsequence_dtw, multiscale_dtw
+
+
+def _quat_mul(a: npt.NDArray, b: npt.NDArray) -> npt.NDArray:
+    """Hamilton product of quaternion arrays, rw, rx, ry, rz along the last axis"""
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def _axis_angle(axis: npt.NDArray, angles: npt.NDArray) -> npt.NDArray:
+    """quaternions for rotations of angles about a unit axis"""
+    return np.column_stack([np.cos(angles / 2), np.outer(np.sin(angles / 2), axis)])
+
+
+def _rotate_x(data: npt.NDArray, angles: npt.NDArray) -> npt.NDArray:
+    """rotate an array of vectors about the x axis"""
+    c, s = np.cos(angles), np.sin(angles)
+    return np.column_stack([
+        data[:,0], 
+        c * data[:,1] - s * data[:,2], 
+        s * data[:,1] + c * data[:,2]
+    ])
+
+
+def _slerp(a: npt.NDArray, b: npt.NDArray, f: npt.NDArray) -> npt.NDArray:
+    """spherical linear interpolation from quaternions a to b by fractions f"""
+    dot = np.sum(a * b, axis=1)
+    b = np.where(dot[:, None] < 0, -b, b)
+    dot = np.minimum(np.abs(dot), 1)
+    theta = np.arccos(dot)
+    small = theta < 1e-6
+    sin_theta = np.where(small, 1, np.sin(theta))
+    wa = np.where(small, 1 - f, np.sin((1 - f) * theta) / sin_theta)
+    wb = np.where(small, f, np.sin(f * theta) / sin_theta)
+    q = wa[:, None] * a + wb[:, None] * b
+    return q / np.linalg.norm(q, axis=1)[:, None]
 
 
 class State(Table):
@@ -67,7 +111,40 @@ class State(Table):
             (att.transform_point(vel)).cumsum()[:-1]
         ]) * time.dt + st.pos
         return State.from_constructs(time,pos, att, vel, rvel)
-    
+
+    def fill_arc(self, time: Time, roll: float=0.0) -> State:
+        '''As fill, but with the exact positions and attitudes of uniform circular motion rather
+        than integrating them, so there is no drift. Optionally superimpose a roll of angle roll
+        (radians) about the body X axis at a constant rate, as superimpose_roll does.'''
+        st = self._slice_rows(len(self) - 1, len(self))
+        t = time.t - time.t[0]
+        v = st.vel.data[0]
+        w = st.rvel.data[0]
+
+        rate = np.linalg.norm(w)
+        if rate == 0:
+            disp = np.outer(t, v)
+            att = np.tile(st.att.data[0], (len(t), 1))
+        else:
+            axis = w / rate
+            vpar = axis * np.dot(axis, v)
+            disp = np.outer(t, vpar) + np.outer(np.sin(rate * t) / rate, v - vpar) + \
+                np.outer((1 - np.cos(rate * t)) / rate, np.cross(axis, v))
+            att = _quat_mul(st.att.data[0], _axis_angle(axis, rate * t))
+
+        pos = st.pos.data[0] + st.att.transform_point(Point(disp)).data
+        vel = np.tile(v, (len(t), 1))
+        rvel = np.tile(w, (len(t), 1))
+
+        if not roll == 0:
+            roll_rate = roll / t[-1]
+            att = _quat_mul(att, _axis_angle(np.array([1.0, 0.0, 0.0]), roll_rate * t))
+            vel, rvel = _rotate_x(vel, -roll_rate * t), _rotate_x(rvel, -roll_rate * t)
+            rvel[:,0] += roll_rate
+
+        return State._from_arrays(dict(
+            time=np.column_stack([time.t, time.dt]), pos=pos, att=att, vel=vel, rvel=rvel
+        ))
 
     def extrapolate(self, duration: float, min_len=3) -> State:
         """Extrapolate the input state assuming uniform circular motion and small angles
@@ -76,6 +153,51 @@ class State(Table):
         time = Time.from_t(np.linspace(0,duration, npoints))
         return self.fill(time)
 
+    def resample(self, rate: float=None, antialias: bool=True) -> State:
+        """Resample to a constant rate.
+
+        Args:
+            rate (float, optional): samples per second. Defaults to State._construct_freq.
+            antialias (bool, optional): when decimating, low pass filter the vector constructs below
+                the new Nyquist frequency first. Defaults to True.
+
+        Returns:
+            State: the vector constructs are interpolated linearly, the attitude by slerp and the
+                labels are taken from the nearest sample.
+        """
+        rate = State._construct_freq if rate is None else rate
+        self._derive_all()
+        t = self.t
+        n = int(np.floor((t[-1] - t[0]) * rate + 1e-9)) + 1
+        new_t = t[0] + np.arange(n) / rate
+
+        i = np.clip(np.searchsorted(t, new_t, side="right") - 1, 0, len(t) - 2) if len(t) > 1 else np.zeros(n, dtype=int)
+        f = np.clip((new_t - t[i]) / (t[i+1] - t[i]), 0, 1) if len(t) > 1 else np.zeros(n)
+
+        wn = 0.8 * rate / ((len(t) - 1) / (t[-1] - t[0])) if len(t) > 1 else 1
+        filt = butter(2, wn, btype='low') if antialias and wn < 1 and len(t) > 9 else None
+
+        cdata = dict(time=np.column_stack([new_t, np.full(n, 1 / rate)]))
+        for k, v in self._cdata.items():
+            if k == "time":
+                continue
+            elif k == "att":
+                cdata[k] = _slerp(v[i], v[np.minimum(i + 1, len(t) - 1)], f)
+            else:
+                if filt is not None:
+                    # a long pad, so linear trends pass through the ends of the data unchanged
+                    v = filtfilt(*filt, v, axis=0, padlen=min(len(t) - 1, int(10 / wn)))
+                cdata[k] = np.column_stack([np.interp(new_t, t, col) for col in v.T])
+
+        nearest = np.where(f < 0.5, i, np.minimum(i + 1, len(t) - 1))
+        return self.__class__.__new__(self.__class__)._setup(
+            cdata,
+            {k: np.interp(new_t, t, v) for k, v in self._partial.items()},
+            {k: v[nearest] for k, v in self._ldata.items()},
+            new_t - new_t[0], 
+            True, True
+        )
+
     @staticmethod
     def from_csv(filename) -> State:
         df = pd.read_csv(filename)
@@ -119,29 +241,6 @@ class State(Table):
           
         return State.from_constructs(time, pos, att, vel, rvel, acc)
 
-    @staticmethod
-    def stack(sections: list) -> Self:
-        """Stack a list of States on top of each other. last row of each is replaced with first row of the next, 
-            indexes are offset so they are sequential. 
-            TODO this should move into the parent class.
-        """
-        # first build list of index offsets, to be added to each dataframe
-        offsets = np.cumsum([0] + [sec.duration for sec in sections[:-1]])
-
-        # The sections to be stacked need their last row removed, as the first row of the next replaces it
-        dfs = [section.data.iloc[:-1] for section in sections[:-1]] + \
-            [sections[-1].data.copy()]
-
-        # offset the df indexes
-        for df, offset in zip(dfs, offsets):
-            df.index = np.array(df.index) - df.index[0] + offset
-        combo = pd.concat(dfs)
-        combo.index.name = "t"
-
-        combo["t"] = combo.index
-
-        return State(combo)
-
     @staticmethod
     def align(
         flown: State, 
@@ -149,12 +248,20 @@ class State(Table):
         radius=5, mirror=True,
         weights = Point(1,1.2,0.5),
         tp_weights = Point(0.6,0.6,0.6),
+        engine: str="dtw",
+        window: int=None
     ) -> Tuple(float, Self):
         """Perform a temporal alignment between two sections. return the flown section with labels 
         copied from the template along the warped path. 
+
+        Args:
+            engine (str): "dtw" for the built in vectorised implementation, "multiscale" for the built in
+                coarse to fine implementation, which is much faster for long sections, or "fastdtw" to use 
+                the fastdtw package. Defaults to "dtw".
+            radius (int): the search radius about the coarser path, used by the multiscale and fastdtw engines.
+            window (int): half width in samples of a Sakoe-Chiba band to restrict the dtw engine to.
+                Defaults to None, which searches the whole cost matrix.
         """
-        from fastdtw import fastdtw
-        from scipy.spatial.distance import euclidean
         def get_brv(brv):
             if mirror:
                 brv = brv.abs() * Point(1, 0, 1) + brv * Point(0, 1, 0 )
@@ -164,15 +271,77 @@ class State(Table):
 
         tp = get_brv(template.rvel * tp_weights)
 
-        distance, path = fastdtw(
-            tp.data,
-            fl.data,
-            radius=radius,
-            dist=euclidean
-        )
+        if engine == "dtw":
+            distance, path = dtw(
+                tp.data, 
+                fl.data, 
+                None if window is None else sakoe_chiba_window(len(tp), len(fl), window)
+            )
+        elif engine == "multiscale":
+            distance, path = multiscale_dtw(tp.data, fl.data, radius)
+        elif engine == "fastdtw":
+            from fastdtw import fastdtw
+            from scipy.spatial.distance import euclidean
+            distance, path = fastdtw(
+                tp.data,
+                fl.data,
+                radius=radius,
+                dist=euclidean
+            )
+        else:
+            raise ValueError(f"unknown alignment engine {engine}, expected dtw, multiscale or fastdtw")
 
         return distance, State.copy_labels(template, flown, path, 2)
 
+    @staticmethod
+    def segment(
+        flown: State,
+        template: State,
+        col: str="manoeuvre",
+        rate: float=5,
+        before: str="tkoff",
+        after: str="land",
+        weights = Point(1,1.2,0.5),
+        tp_weights = Point(0.6,0.6,0.6),
+        speed_weight: float=0.02,
+    ) -> State:
+        """Find a labelled template (for example a whole schedule) within a long flight and copy 
+        its labels across, without needing the flight to be split up beforehand.
+
+        The mirrored body rates of both are averaged into bins of 1 / rate seconds and matched
+        with a subsequence dtw, which walks the flight once. The speed is included as well, 
+        otherwise time on the ground cannot be told apart from a line.
+
+        Args:
+            col (str): the label to copy. Defaults to "manoeuvre".
+            rate (float): the rate in Hz to match the body rates at. Defaults to 5.
+            before (str): the label for the flight before the template starts. Defaults to "tkoff".
+            after (str): the label for the flight after the template ends. Defaults to "land".
+            speed_weight (float): scale applied to the speed. Defaults to 0.02.
+
+        Returns:
+            State: the flight labelled with col
+        """
+        def get_brv(st: State, w: Point):
+            brv = st.rvel * w
+            brv = brv.abs() * Point(1, 0, 1) + brv * Point(0, 1, 0 )
+            brv = np.column_stack([(brv * weights).data, abs(st.vel) * speed_weight])
+            bins = np.floor((st.t - st.t[0]) * rate).astype(int)
+            starts = np.flatnonzero(np.diff(bins, prepend=-1))
+            return np.add.reduceat(brv, starts) / np.diff(np.append(starts, len(st)))[:, None], starts
+
+        fl, fl_starts = get_brv(flown, Point(1, 1, 1))
+        tp, tp_starts = get_brv(template, tp_weights)
+
+        distance, path = subsequence_dtw(fl, tp)
+        path = np.array(path)
+
+        bin_labels = np.full(len(fl), before, dtype=object)
+        bin_labels[path[-1, 0]:] = after
+        bin_labels[path[:, 0]] = template.__getattr__(col)[tp_starts][path[:, 1]]
+        
+        return flown.label(**{col: np.repeat(bin_labels, np.diff(np.append(fl_starts, len(flown))))})
+
     def splitter_labels(self: State, mans: List[dict], better_names: List[str]=None) -> State:
             """label the manoeuvres in a State based on the flight coach splitter information
 
@@ -212,7 +381,8 @@ class State(Table):
             return State.stack(labelled)
 
     def get_subset(self: State, mans: Union[list, slice], col="manoeuvre", min_len=1) -> Self:
-        selectors = self.data.loc[:,col].unique()
+        index = self._label_index([col])[0]
+        selectors = index.loc[:, col].to_numpy()
         if isinstance(mans, slice):
             mans = selectors[mans]
 
@@ -226,6 +396,9 @@ class State(Table):
             
         assert all(isinstance(m, str) for m in mans)
 
+        rngs = index.loc[index.loc[:, col].isin(mans)]
+        if len(rngs) == 1 and rngs.len.iloc[0] == rngs.end.iloc[0] - rngs.start.iloc[0] + 1:
+            return self._slice_rows(rngs.start.iloc[0], rngs.end.iloc[0] + 1, min_len)
         return State(self.data.loc[self.data.loc[:, col].isin(mans)], False, min_len)
 
     def get_manoeuvre(self: State, manoeuvre: Union[str, list, int]) -> Self:
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Union
+import numpy as np
+import numpy.typing as npt
+from geometry import Point, Quaternion
+from flightanalysis import Time
+from .state import State
+
+
+class StateStream:
+    """Build a State incrementally from chunks of position and attitude samples, for instance
+    from live telemetry.
+
+    vel, rvel, acc and racc are finite differences spanning two samples either side, so each row
+    can only be emitted once the two samples after it have arrived. The stream only holds on to the
+    four samples needed to continue the stencil, plus optionally the most recent maxlen emitted
+    rows in history, so memory use does not grow with the length of the flight.
+
+    The rows match State.from_constructs(time, pos, att) over the whole flight, except rvel (and
+    so racc), as for n samples Quaternion.body_diff scales dt by n / (n - 1), which is not known
+    until the stream ends. That is left out here.
+    """
+    stencil = 2
+
+    def __init__(self, maxlen: int=0):
+        """
+        Args:
+            maxlen (int, optional): number of emitted rows to keep in history. Defaults to 0.
+        """
+        self.maxlen = maxlen
+        self.history: State = None
+        self._t = np.empty(0)
+        self._pos = np.empty((0, 3))
+        self._att = np.empty((0, 4))
+        self._started = False
+
+    def _window(self) -> State:
+        time = Time.from_t(self._t)
+        pos, att = Point(self._pos), Quaternion(self._att)
+        if len(self._t) < 2:
+            return State.from_constructs(time, pos, att)
+        rates = Quaternion.body_axis_rates(
+            Quaternion(self._att[:-1]), Quaternion(self._att[1:])
+        ).data / time.dt[:-1, None]
+        return State.from_constructs(time, pos, att, rvel=Point(np.vstack([rates, rates[-1:]])))
+
+    def _emit(self, start: int, stop: int) -> State:
+        block = self._window()._slice_rows(start, stop)
+        if self.maxlen > 0:
+            blocks = [block] if self.history is None else [self.history, block]
+            self.history = State._from_arrays(
+                {k: np.concatenate([b._cdata[k] for b in blocks])[-self.maxlen:] for k in block._cdata}
+            )
+        self._started = True
+        return block
+
+    def add(self, t: npt.NDArray, pos: Point, att: Quaternion) -> Union[State, None]:
+        """Add a chunk of samples.
+
+        Args:
+            t (npt.NDArray): sample times, continuing on from the previous chunk
+            pos (Point): positions
+            att (Quaternion): attitudes
+
+        Returns:
+            Union[State, None]: the rows that are now complete, None if there are not yet enough samples
+        """
+        self._t = np.concatenate([self._t, np.atleast_1d(t)])
+        self._pos = np.vstack([self._pos, pos.data])
+        self._att = np.vstack([self._att, att.data])
+
+        start = self.stencil if self._started else 0
+        stop = len(self._t) - self.stencil
+        if len(self._t) < 2 * self.stencil + 1 or stop <= start:
+            return None
+
+        block = self._emit(start, stop)
+        keep = slice(stop - self.stencil, None)
+        self._t, self._pos, self._att = self._t[keep], self._pos[keep], self._att[keep]
+        return block
+
+    def flush(self) -> Union[State, None]:
+        """Emit the remaining rows at the end of the stream, using one sided differences for the
+        last samples as State does."""
+        start = self.stencil if self._started else 0
+        if len(self._t) <= start:
+            return None
+        block = self._emit(start, len(self._t))
+        self._t, self._pos, self._att = self._t[:0], self._pos[:0], self._att[:0]
+        return block
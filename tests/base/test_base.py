@@ -37,10 +37,30 @@ def test_tab_getitem(tab_full):
     pass
 
 
+def test_tab_getitem_row(tab_full):
+    assert len(tab_full[20]) == 1
+    assert tab_full[20].t[0] == tab_full.t[np.argmin(abs(tab_full.t - 20))]
+    assert tab_full[-1].t[0] == tab_full.t[-1]
+    assert tab_full[1000].t[0] == tab_full.t[-1]
+    assert np.shares_memory(tab_full[-1].t, tab_full.t)
+    assert [r.t[0] for r in tab_full] == list(tab_full.t)
+
+
 def test_copy(tab_full):
     tab2 = tab_full.copy()
     np.testing.assert_array_equal(tab2.t, tab_full.t)
 
     tab3 = tab_full.copy(time=Time.from_t(tab_full.t+10))
 
-    np.testing.assert_array_equal(tab3.t, tab_full.t + 10)
\ No newline at end of file
+    np.testing.assert_array_equal(tab3.t, tab_full.t + 10)
+
+def test_getattr_no_copy(tab_full):
+    assert np.shares_memory(tab_full.time.data, tab_full.t)
+    assert not tab_full.t.flags.writeable
+
+
+def test_label(tab_full):
+    tab = tab_full.label(element="e0")
+    assert tab.data.element.iloc[0] == "e0"
+    assert np.shares_memory(tab.time.data, tab_full.time.data)
+    assert tab.remove_labels().label_cols == []
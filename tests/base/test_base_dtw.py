@@ -0,0 +1,70 @@
+from flightanalysis.base.dtw import dtw, sakoe_chiba_window, full_window, subsequence_dtw, multiscale_dtw, path_window
+from fastdtw import dtw as reference_dtw
+from scipy.spatial.distance import euclidean
+import numpy as np
+from pytest import approx, fixture
+
+
+@fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = np.cumsum(rng.normal(size=(60, 3)), axis=0)
+    return x, x[np.sort(rng.integers(0, 60, 80))]
+
+
+def test_dtw(series):
+    distance, path = dtw(*series)
+    ref_distance, ref_path = reference_dtw(*series, dist=euclidean)
+    assert distance == approx(ref_distance)
+    assert path[0] == (0, 0)
+    assert path[-1] == (59, 79)
+    assert sum(np.linalg.norm(series[0][i] - series[1][j]) for i, j in path) == approx(distance)
+
+
+def test_dtw_single():
+    distance, path = dtw(np.zeros((1, 3)), np.ones((4, 3)))
+    assert path == [(0, 0), (0, 1), (0, 2), (0, 3)]
+    assert distance == approx(4 * np.sqrt(3))
+
+
+def test_sakoe_chiba_window():
+    lo, hi = sakoe_chiba_window(60, 80, 5)
+    assert lo[0] == 0 and hi[-1] == 80
+    assert np.all(hi > lo)
+    assert np.all(np.diff(lo) >= 0) and np.all(np.diff(hi) >= 0)
+    np.testing.assert_array_equal(full_window(60, 80)[1], np.full(60, 80))
+
+
+def test_dtw_window(series):
+    distance, path = dtw(*series, sakoe_chiba_window(60, 80, 5))
+    lo, hi = sakoe_chiba_window(60, 80, 5)
+    assert all(lo[i] <= j < hi[i] for i, j in path)
+    assert distance >= dtw(*series)[0]
+
+
+def test_path_window(series):
+    path = dtw(*series)[1]
+    lo, hi = path_window(path, 60, 80)
+    assert all(lo[i] <= j < hi[i] for i, j in path)
+    assert np.all(np.diff(lo) >= 0) and np.all(np.diff(hi) >= 0)
+
+    lo, hi = path_window([(i // 2, j // 2) for i, j in path], 60, 80, 0, 2)
+    assert all(lo[i] <= j < hi[i] for i, j in path)
+
+
+def test_multiscale_dtw(series):
+    distance, path = multiscale_dtw(*series, radius=5)
+    assert distance == approx(dtw(*series)[0])
+    assert path[0] == (0, 0)
+    assert path[-1] == (59, 79)
+
+
+def test_subsequence_dtw():
+    rng = np.random.default_rng(1)
+    y = np.cumsum(rng.normal(size=(40, 2)), axis=0)
+    x = np.vstack([rng.normal(size=(25, 2)) + 50, np.repeat(y, 2, axis=0), rng.normal(size=(30, 2)) - 50])
+    distance, path = subsequence_dtw(x, y)
+    assert distance == approx(0)
+    assert path[0] in [(25, 0), (26, 0)]
+    assert path[-1][1] == 39
+    assert path[-1][0] in (103, 104)
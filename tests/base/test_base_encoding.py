@@ -0,0 +1,24 @@
+from flightanalysis.base.encoding import encode_array, decode_array, encode_runs, decode_runs
+import numpy as np
+from json import dumps, loads
+from pytest import mark
+
+
+@mark.parametrize("delta,compress", [(False, False), (True, False), (False, True), (True, True)])
+def test_encode_array(delta, compress):
+    arr = np.cumsum(np.random.default_rng(0).normal(size=500))
+    res = decode_array(loads(dumps(encode_array(arr, "float64", delta, compress))))
+    np.testing.assert_array_equal(res, arr)
+
+
+def test_encode_array_float32():
+    arr = np.linspace(0, 100, 300)
+    res = decode_array(encode_array(arr, "float32", True, True))
+    np.testing.assert_allclose(res, arr, rtol=1e-6)
+
+
+def test_encode_runs():
+    labels = np.array(list("aaabbbbca"), dtype=object)
+    enc = encode_runs(labels)
+    assert enc == dict(values=["a", "b", "c", "a"], lengths=[3, 4, 1, 1])
+    np.testing.assert_array_equal(decode_runs(enc), labels)
@@ -0,0 +1,8 @@
+from pytest import fixture
+from flightanalysis import SchedDef, State
+
+
+@fixture(scope="session")
+def p23_template() -> State:
+    """A perfectly flown p23 schedule"""
+    return SchedDef.load("p23").create_template(170, 1)[1]
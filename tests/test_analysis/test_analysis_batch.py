@@ -0,0 +1,36 @@
+from flightanalysis.analysis import batch
+from flightanalysis.analysis.batch import score_fcjs
+from json import JSONDecodeError
+from pytest import fixture, warns
+
+
+@fixture
+def files(tmp_path):
+    good = tmp_path / "good.json"
+    good.write_text("{}")
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    return good, bad
+
+
+def test_score_fcjs_single_file(files, monkeypatch):
+    monkeypatch.setattr(batch, "score_fcj", lambda file: (file, {}))
+    assert list(score_fcjs(files[0], workers=1)) == [(str(files[0]), {})]
+    assert list(score_fcjs(str(files[0]), workers=1)) == [(str(files[0]), {})]
+
+
+def test_score_fcjs_errors(files, monkeypatch):
+    score_fcj = batch.score_fcj
+    monkeypatch.setattr(batch, "score_fcj", lambda file: (file, {}) if file == str(files[0]) else score_fcj(file))
+    with warns(UserWarning):
+        res = dict(score_fcjs(files, workers=1))
+    assert res[str(files[0])] == {}
+    assert isinstance(res[str(files[1])], JSONDecodeError)
+
+
+def test_score_fcjs_errors_parallel(files):
+    with warns(UserWarning):
+        res = dict(score_fcjs(list(files) + [files[0].parent / "missing.json"], workers=2))
+    assert len(res) == 3
+    assert isinstance(res[str(files[1])], JSONDecodeError)
+    assert isinstance(res[str(files[0].parent / "missing.json")], FileNotFoundError)
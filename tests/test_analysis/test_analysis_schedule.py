@@ -0,0 +1,50 @@
+from flightanalysis import SchedDef, State, ScheduleAnalysis, ManoeuvreAnalysis
+import numpy as np
+from pytest import approx
+from .conftest import p23_template
+
+
+def test_build(p23_template: State):
+    sdef = SchedDef.load("p23")[:2]
+    sa = ScheduleAnalysis.build(sdef, p23_template)
+    assert [ma.uid for ma in sa] == [md.uid for md in sdef]
+    assert isinstance(sa[0], ManoeuvreAnalysis)
+
+
+def test_build_parallel(p23_template: State):
+    serial = ScheduleAnalysis.build(SchedDef.load("p23")[:2], p23_template)
+    parallel = ScheduleAnalysis.build(SchedDef.load("p23")[:2], p23_template, workers=2)
+    assert [ma.uid for ma in parallel] == [ma.uid for ma in serial]
+    for s, p in zip(serial, parallel):
+        assert p.scores().score() == approx(s.scores().score())
+
+
+def test_build_resampled(p23_template: State):
+    mdef = SchedDef.load("p23")[1]
+    flown = p23_template.get_manoeuvre(mdef.uid)
+    ma = ManoeuvreAnalysis.build(mdef, flown, rate=15)
+    assert len(ma.aligned) == int(flown.duration * 15) + 1
+    assert np.all(ma.aligned.dt == approx(1 / 15))
+
+
+def test_rescore(p23_template: State):
+    from flightanalysis.schedule.scoring.criteria import Continuous, Exponential
+    from flightanalysis.schedule.scoring.criteria.f3a_criteria import F3A
+    mdef = SchedDef.load("p23")[1]
+    ma = ManoeuvreAnalysis.build(mdef, p23_template.get_manoeuvre(mdef.uid))
+    first = ma.intra()
+    assert ma.intra().total == approx(first.total)
+
+    assert not "intra_results" in ma.to_dict()
+    ma2 = ManoeuvreAnalysis.from_dict(ma.to_dict(include_measurements=True))
+    assert ma2.intra_results is not None
+
+    old = F3A.intra.track
+    F3A.intra.track = Continuous(Exponential(10, 1, 10), 'absolute')
+    try:
+        rescored = ma2.intra()
+        fresh = ma.intended.analyse(ma.aligned, ma.intended_template)
+    finally:
+        F3A.intra.track = old
+    assert rescored.total == approx(fresh.total)
+    assert rescored.total > first.total
@@ -1,6 +1,7 @@
 from pytest import fixture
 from flightanalysis.schedule.scoring.criteria import Criteria, Single, Exponential, Continuous, Combination, Comparison
 from numpy.testing import assert_array_almost_equal
+import numpy as np
 
 @fixture
 def single():
@@ -51,6 +52,43 @@ def test_continuous_call_absolute(continuous):
     assert_array_almost_equal(dgs, [0.1,0.2])
 
 
+def test_continuous_batch():
+    series = [
+        [1.1, 1.2, 1, 1.2, 1.3, 1.1], 
+        [], 
+        [1.0, 0.5, 0.7], 
+        [0.1, 0.3, np.nan, 0.2, 0.4, 0.1], 
+        [0.5]
+    ]
+    expected = dict(
+        absolute = [([1, 4], [0.1, 0.3]), ([], []), ([2], [0.2]), ([1, 4], [0.2, 0.2]), ([], [])],
+        ratio = [([0, 1, 2, 4], [0, 0.1/1.1, 0.2, 0.3]), ([], []), ([1, 2], [1, 0.4]), ([0, 1, 3, 4], [0, 2, 0.5, 1]), ([], [])]
+    )
+    for comparison, results in expected.items():
+        crit = Continuous(Exponential(1,1), comparison)
+        for (ids, mistakes, dgs), (eids, emistakes) in zip(crit.batch([np.array(s) for s in series]), results):
+            assert_array_almost_equal(ids, eids)
+            assert_array_almost_equal(mistakes, emistakes)
+            assert_array_almost_equal(dgs, emistakes)
+
+    padded = Continuous(Exponential(1,1), 'absolute').batch(np.array([[0.1, 0.2, 0.1, 0.3], [0.2, 0.1, 9, 9]]), [4, 2])
+    assert_array_almost_equal(padded[0][0], [1, 3])
+    assert_array_almost_equal(padded[0][1], [0.1, 0.2])
+    assert len(padded[1][0]) == 0
+
+    assert len(Continuous(Exponential(1,1), 'ratio').batch([np.array([])])[0][0]) == 0
+
+    rows = [[1, 2, 3, 4, 5], [1, 2, 1, 2, 1], [3, 2, 1, 2, 3]]
+    for comparison in ['absolute', 'ratio']:
+        crit = Continuous(Exponential(1,1), comparison)
+        padded = crit.batch(np.array(rows, dtype=float), [1, 5, 0])
+        listed = crit.batch([np.array(rows[0][:1]), np.array(rows[1], dtype=float), np.array([])])
+        for res, eres in zip(padded, listed):
+            for v, ev in zip(res, eres):
+                assert_array_almost_equal(v, ev)
+        assert len(padded[0][0]) == 0 and len(padded[2][0]) == 0
+
+
 def test_combination_from_dict(combination):
     res = Criteria.from_dict(combination.to_dict())
     assert res == combination
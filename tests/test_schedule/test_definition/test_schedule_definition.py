@@ -1,9 +1,9 @@
-from pytest import fixture
+from pytest import fixture, approx
 
 from flightanalysis.schedule.definition import *
 from flightanalysis.schedule.elements import *
 from flightanalysis.schedule.scoring import *
-from flightanalysis import Manoeuvre, SchedDef
+from flightanalysis import Manoeuvre, SchedDef, State
 import numpy as np
 from json import load
 
@@ -66,3 +66,41 @@ def test_mdef_parse_dict(p23_def_dict):
     pass
 
 
+
+
+def test_load_cached():
+    sdef = SchedDef.load("p23")
+    sdef[0].mps.loop_radius.default = 100
+    assert SchedDef.load("P23")[0].mps.loop_radius.default == 55
+    assert not SchedDef.load("p23")[0] is SchedDef.load("p23")[0]
+
+def test_load_cached_shares_eldefs():
+    sdef, sdef2 = SchedDef.load("p23"), SchedDef.load("p23")
+    assert sdef[0].eds is sdef2[0].eds
+    assert not sdef[0].mps.line_length is sdef2[0].mps.line_length
+
+    sdef[0].mps.line_length.default = sdef2[0].mps.line_length.default + 20
+    pad = sdef[0].eds.e_1_pad1
+    assert pad(sdef[0].mps).length == approx(pad(sdef2[0].mps).length + 10)
+
+def test_create_template_cached(vline):
+    itrans = vline.info.initial_transform(170, 1)
+    man = vline.create(itrans).add_lines()
+    expected = man.create_template(itrans)
+    
+    _, tp = vline.create_template(itrans)
+    _, tp2 = vline.create_template(itrans)
+    
+    np.testing.assert_allclose(tp.pos.data, expected.pos.data, atol=1e-9)
+    np.testing.assert_allclose(tp2.att.data, expected.att.data, atol=1e-9)
+    assert np.all(tp.element == expected.element)
+
+def test_create_template_stacks_arrays(vline, monkeypatch):
+    def _stack_frames(sections):
+        raise AssertionError("fell back to the pandas stack")
+    monkeypatch.setattr(State, "_stack_frames", _stack_frames)
+    itrans = vline.info.initial_transform(170, 1)
+    man, tp = vline.create_template(itrans)
+    _, tp2 = vline.create_template(itrans)
+    assert np.all(tp2.data.manoeuvre == man.uid)
+    np.testing.assert_array_equal(tp2.data.element, tp.data.element)
@@ -0,0 +1,32 @@
+from flightanalysis.schedule.scoring.downgrade import fill_nans, convolve, remove_outliers
+import numpy as np
+import pandas as pd
+
+
+def test_fill_nans():
+    data = np.array([
+        [np.nan, 1, np.nan, 3, np.nan],
+        [2, np.nan, np.nan, np.nan, 5],
+    ])
+    filled = fill_nans(data)
+    for row, res in zip(data, filled):
+        np.testing.assert_array_equal(res, pd.Series(row).ffill().bfill().to_numpy())
+    np.testing.assert_array_equal(fill_nans(data[0]), filled[0])
+
+
+def test_convolve():
+    data = np.random.random(50)
+    np.testing.assert_array_equal(convolve(np.vstack([data, data]), 10)[1], convolve(data, 10))
+    np.testing.assert_array_almost_equal(
+        convolve(data, 10)[5:-4], 
+        pd.Series(data).rolling(10).mean().to_numpy()[9:]
+    )
+    assert convolve(data, 10)[0] == convolve(data, 10)[5]
+
+
+def test_remove_outliers():
+    data = np.vstack([np.zeros(20), np.arange(20)])
+    data[0, 10] = 100
+    res = remove_outliers(data)
+    assert res[0, 10] == 0
+    np.testing.assert_array_equal(res[1], remove_outliers(data[1]))
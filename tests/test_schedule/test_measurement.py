@@ -1,5 +1,5 @@
 from flightanalysis import State
-from flightanalysis.schedule.scoring import Measurement
+from flightanalysis.schedule.scoring import Measurement, Samples
 from geometry import Point, Quaternion, Transformation, PX, PY, Euldeg, P0, Q0
 from pytest import fixture
 import numpy as np
@@ -32,4 +32,43 @@ def test_track_y_loop(loop_tp: State):
     tp = loop_tp.move(Transformation(PY(100),Euldeg(0, 270, 0)))
     fl = track_setup(tp, Euldeg(0, 0, 10))
     m = Measurement.track_y(fl, tp, tp[0].transform)
-    np.testing.assert_array_almost_equal(np.degrees(abs(m.value)), np.full(len(m.value), 0.0))
\ No newline at end of file
+    np.testing.assert_array_almost_equal(np.degrees(abs(m.value)), np.full(len(m.value), 0.0))
+
+
+def test_samples_slice(loop_tp: State):
+    tp = loop_tp.move(Transformation(PY(100),Euldeg(0, 270, 0)))
+    fl = track_setup(tp, Euldeg(0, 0, 10))
+    whole = Samples(fl, tp)[5:20]
+    flp, tpp = fl._slice_rows(5, 20), tp._slice_rows(5, 20)
+    part = Samples(flp, tpp)
+    np.testing.assert_array_almost_equal(whole.pos_vis, part.pos_vis)
+    np.testing.assert_array_almost_equal(whole.world_roll_error.data, part.world_roll_error.data)
+
+    m0 = Measurement.track_y(flp, tpp, tp[0].transform)
+    m1 = Measurement.track_y(flp, tpp, tp[0].transform, whole)
+    np.testing.assert_array_almost_equal(m0.value, m1.value)
+    np.testing.assert_array_almost_equal(m0.visibility, m1.visibility)
+
+
+def test_samples_slice_lazy(loop_tp: State):
+    tp = loop_tp.move(Transformation(PY(100),Euldeg(0, 270, 0)))
+    fl = track_setup(tp, Euldeg(0, 0, 10))
+    samples = Samples(fl, tp)
+    part = samples[5:20]
+    assert len(samples._cache) == 0
+    part.pos_vis
+    assert set(samples._cache.keys()) == {"pos_vis"}
+    np.testing.assert_array_equal(samples[20:30].pos_vis, samples.pos_vis[20:30])
+    assert len(samples._cache) == 1
+
+
+def test_samples_track(line_tp: State):
+    tp = line_tp.move(Transformation(PY(100),Euldeg(0, 270, 0)))
+    fl = track_setup(tp, Euldeg(0, 10, 10))
+    samples = Samples(fl, tp)
+    my = Measurement.track_y(fl, tp, tp[0].transform, samples)
+    cverr, wverr, vis = samples.track(tp[0].transform)
+    mz = Measurement.track_z(fl, tp, tp[0].transform, samples)
+    assert samples.track(tp[0].transform)[0] is cverr
+    np.testing.assert_array_almost_equal(my.value, Measurement.track_y(fl, tp, tp[0].transform).value)
+    np.testing.assert_array_almost_equal(mz.value, Measurement.track_z(fl, tp, tp[0].transform).value)
@@ -24,3 +24,9 @@ def test_create_template(tophat: Manoeuvre, itrans):
     template = tophat.create_template(itrans)
 
     assert isinstance(template, State)
+
+
+def test_create_template_labels(tophat: Manoeuvre, itrans):
+    template = tophat.create_template(itrans)
+    assert all(template.manoeuvre == tophat.uid)
+    assert list(template.unique_labels().element) == [el.uid for el in tophat.all_elements()]
@@ -39,6 +39,29 @@ def test_from_constructs():
     )
     assert st.pos == Point.zeros()
 
+def test_from_constructs_lazy():
+    st = State.from_constructs(
+        time=Time.from_t(np.linspace(0, 1, 10)), 
+        pos=PX(10) * np.linspace(0, 1, 10), 
+        att=Quaternion.from_euler(Point.zeros(10))
+    )
+    assert "vel" in st._pending
+    assert st.vel.x == approx(np.full(10, 10))
+    assert not "vel" in st._pending
+    assert st.vel.data is st.vel.data
+    assert all([col in st.data.columns for col in st.constructs.cols()])
+
+
+def test_copy_lazy():
+    st = State.from_constructs(
+        time=Time.from_t(np.linspace(0, 1, 10)), 
+        pos=PX(10) * np.linspace(0, 1, 10), 
+        att=Quaternion.from_euler(Point.zeros(10))
+    )
+    copied = st.copy(pos=PX(50) * np.linspace(0, 1, 10))
+    assert copied.vel.x == approx(np.full(10, 10))
+
+
 def test_from_transform():
     st =State.from_transform(Transformation())
     assert st.vel.x == 0
@@ -57,6 +80,51 @@ def test_to_from_dict(state):
     assert st_new.duration == state.duration
 
 
+def test_to_from_dict_compact(state):
+    st = state.label(manoeuvre="test")
+    st_new = State.from_dict(loads(dumps(st.to_dict(compact=True, delta=True, compress=True))))
+    pd.testing.assert_frame_equal(st_new.data, st.data)
+
+
+def test_save_load(state, tmp_path):
+    st = state.label(manoeuvre=["a"] * 100 + ["b"] * 100, element=np.full(200, np.nan, dtype=object))
+    file = st.save(tmp_path / "state.fat")
+    for mmap in [True, False]:
+        st2 = State.load(file, mmap)
+        pd.testing.assert_frame_equal(st2.data, st.data)
+        assert not st2.pos.data.flags.writeable
+
+
+def test_open(state, tmp_path):
+    st = state.label(manoeuvre=["a"] * 50 + ["b"] * 100 + ["a"] * 50)
+    file = st.open(st.save(tmp_path / "state.fat"))
+    assert len(file) == 200
+    b = file.get_manoeuvre("b")
+    assert isinstance(b, State)
+    np.testing.assert_array_equal(b.pos.data, st.pos.data[50:150])
+    assert b.data.index[0] == 0
+    assert len(file.get_manoeuvre(0)) == 100
+    np.testing.assert_array_equal(file.get_subset(["a", "b"]).pos.data, st.pos.data)
+
+
+def test_stack():
+    st = State.from_transform(Transformation.zero(), vel=PX(10)).extrapolate(2)
+    secs = [st.label(element=f"test{i}") for i in range(3)]
+    stacked = State.stack(secs)
+    expected = State._stack_frames(secs)
+    assert len(stacked) == 3 * len(st) - 2
+    np.testing.assert_array_equal(stacked.data.to_numpy(), expected.data.to_numpy())
+    np.testing.assert_array_equal(stacked.data.index, expected.data.index)
+
+
+def test_stack_label_dtypes():
+    st = State.from_transform(Transformation.zero(), vel=PX(10)).extrapolate(2)
+    stacked = State.stack([st.label(element=np.full(len(st), np.nan)), st.label(element='e1')])
+    assert stacked.element.dtype == object
+    assert np.all(np.isnan(stacked.element[:len(st) - 1].astype(float)))
+    assert np.all(stacked.element[len(st) - 1:] == 'e1')
+
+
 @fixture
 def labst():
     st=State.from_transform(Transformation.zero()).extrapolate(10)
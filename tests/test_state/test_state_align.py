@@ -95,7 +95,7 @@ def test_subset(aligned):
     assert al_ss.data.element.unique()[0] == els[2]
 
 
-from geometry import PX
+from geometry import PX, Point
 from flightanalysis.base.table import Time
 
 
@@ -172,4 +172,39 @@ def test_shift_label(labst: State):
         ).get_label_len(manoeuvre='m', element='o') == 1
     assert labst.shift_label(
         -1,1, manoeuvre='m', element='a'
-        ).get_label_len(manoeuvre='m', element='o') == 1
\ No newline at end of file
+        ).get_label_len(manoeuvre='m', element='o') == 1
+
+def test_label_ranges_split_label():
+    st = State.from_transform(vel=PX(30)).fill(Time.from_t(np.linspace(0, 1, 6))) \
+        .label(element=list('aabbaa'))
+    res = st.label_ranges()
+    assert list(res.element) == ['a', 'b']
+    assert list(res.start) == [0, 2]
+    assert list(res.end) == [5, 3]
+    assert st.label_lens() == {'a': 4, 'b': 2}
+    assert len(st.get_label_subset(element='a')) == 4
+
+
+def test_get_element_view(labst: State):
+    el = labst.get_element('b')
+    assert np.shares_memory(el.pos.data, labst.pos.data)
+    assert el.data.index[0] == 0
+    moved = el.relocate(Point(10, 0, 0))
+    assert not np.shares_memory(moved.pos.data, labst.pos.data)
+    assert labst.pos.x[4] == el.pos.x[0]
+
+
+def test_segment():
+    sdef = SchedDef.load("p23")
+    tps = [md.create_template(md.info.initial_transform(170, 1))[1] for md in list(sdef)[:3]]
+    template = State.stack(tps)
+    ground = State.from_transform(Transformation(template.pos[0], template.att[0])).extrapolate(10)
+    flown = State.stack([ground, template.remove_labels(), ground.relocate(template.pos[-1])])
+
+    segmented = State.segment(flown, template)
+    assert segmented.manoeuvre[0] == "tkoff"
+    assert segmented.manoeuvre[-1] == "land"
+    assert list(segmented.label_ranges(["manoeuvre"]).manoeuvre) == \
+        ["tkoff"] + [md.info.short_name for md in list(sdef)[:3]] + ["land"]
+    middle = segmented.get_manoeuvre(sdef[1].info.short_name)
+    assert abs(len(middle) - len(tps[1])) < 30
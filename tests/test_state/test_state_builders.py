@@ -1,7 +1,7 @@
 from flightanalysis import State, Box, Time
 from flightdata import Flight
 from pytest import approx, mark
-from geometry import Transformation, PX, PY, P0, Point
+from geometry import Transformation, PX, PY, P0, Point, Euler
 from geometry.testing import assert_almost_equal
 import numpy as np
 import pandas as pd
@@ -81,3 +81,29 @@ def test_fill():
     assert st.pos.x[0] == approx(0)
     assert st.pos.x[-1] == approx(10)
     
+
+
+def test_fill_arc():
+    _t = Time.from_t(np.linspace(0, 2 * np.pi, 61))
+    st0 = State.from_transform(Transformation(PY(10), Euler(0, 0, np.pi/2)), vel=PX(10), rvel=PY(1))
+    st = st0.fill_arc(_t)
+    
+    assert_almost_equal(st.pos[-1], st.pos[0])
+    assert abs(st.pos - Point(0, 10, -10)) == approx(np.full(61, 10))
+    assert_almost_equal(st.att[-1].transform_point(PX()), st.att[0].transform_point(PX()))
+
+    rolled = st0.fill_arc(_t, np.pi)
+    assert_almost_equal(rolled.pos, st.pos)
+    assert_almost_equal(rolled.att.transform_point(rolled.vel), st.att.transform_point(st.vel))
+    assert rolled.p == approx(np.full(61, 0.5))
+
+
+def test_resample():
+    st = State.from_transform(Transformation(P0(), Euler(0.5, 0, 0)), vel=PX(30), rvel=PX(1)) \
+        .fill_arc(Time.from_t(np.linspace(0, 2, 201))).label(element="e0")
+    rs = st.resample(25)
+    assert len(rs) == 51
+    np.testing.assert_array_almost_equal(rs.dt, np.full(51, 0.04))
+    np.testing.assert_array_almost_equal(rs.pos.x, rs.t * 30)
+    np.testing.assert_array_almost_equal(rs.att.data, st.att.data[::4])
+    assert all(rs.element == "e0")
@@ -0,0 +1,33 @@
+import numpy as np
+from pytest import fixture
+from geometry import Point, Euler
+from flightanalysis import State, StateStream, Time
+
+
+@fixture
+def samples():
+    t = np.linspace(0, 10, 200)
+    pos = Point(np.column_stack([30 * t, 5 * np.sin(t), np.cos(t)]))
+    att = Euler(np.column_stack([0.5 * np.sin(t), 0.2 * t, np.zeros(len(t))]))
+    return t, pos, att
+
+
+def test_stream(samples):
+    t, pos, att = samples
+    ss = StateStream(maxlen=50)
+    blocks = [ss.add(t[i:i+7], pos[i:i+7], att[i:i+7]) for i in range(0, len(t), 7)] + [ss.flush()]
+    batch = State.from_constructs(Time.from_t(t), pos, att)
+    streamed = lambda cols: np.concatenate([b.data.loc[:, cols].to_numpy() for b in blocks if b is not None])
+
+    exact = ["t", "x", "y", "z", "rw", "rx", "ry", "rz", "u", "v", "w", "du", "dv", "dw"]
+    np.testing.assert_array_equal(streamed(exact), batch.data.loc[:, exact].to_numpy())
+
+    # Quaternion.body_diff scales dt by n / (n - 1) for the whole flight, the stream cannot know n
+    rates = ["p", "q", "r", "dp", "dq", "dr"]
+    np.testing.assert_allclose(
+        streamed(rates), 
+        batch.data.loc[:, rates].to_numpy() * len(t) / (len(t) - 1), 
+        atol=1e-9
+    )
+    assert len(ss.history) == 50
+    assert ss.history.t[-1] == t[-1]